@@ -1,22 +1,29 @@
 import streamlit as st
 import pandas as pd
 import time
-import io
 import requests
-from bs4 import BeautifulSoup
 from datetime import date, datetime, timedelta
-from pygooglenews import GoogleNews
-from urllib.parse import urlparse
 import re
 import base64  # Impor untuk encoding PDF
+import uuid
+import json
 
 # --- Impor untuk integrasi Google Sheets ---
 import gspread
 from google.oauth2.service_account import Credentials
 
-# --- Impor untuk Selenium ---
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
+# --- Impor modul SKENA (pipeline scraping & penyimpanan lokal) ---
+from workbook_loader import MIN_INTERVAL_REVALIDASI, load_workbook
+from search_cache import SearchCache
+from article_store import ArticleStore
+from pipeline import format_status
+from monitor import MonitorSets, jadwalkan
+from watermark import WatermarkStore
+from exporter import FORMAT_EKSPOR, ekspor, format_tersedia, hapus_semua as hapus_semua_ekspor
+from jobs import STATUS_AKTIF, STATUS_ANTRI, STATUS_DAPAT_DILANJUTKAN, STATUS_DIHENTIKAN, STATUS_GAGAL, STATUS_SEBAGIAN, STATUS_TERPUTUS, KOLOM_URUT, SINYAL_DAUR_ULANG_BROWSER, JobQueue, atribut_hasil, ensure_workers
+
+BARIS_LIVE = 200  # baris terbaru yang ditampilkan selama job berjalan
+UKURAN_HALAMAN = [25, 50, 100, 250]
 
 # --- Konfigurasi Halaman Streamlit ---
 st.set_page_config(
@@ -85,27 +92,15 @@ st.markdown(custom_css, unsafe_allow_html=True)
 
 
 # --- FUNGSI-FUNGSI PENDUKUNG (Tetap sama, tidak perlu diubah) ---
-@st.cache_data
-def load_data_from_url(url, sheet_name=0):
+@st.cache_data(ttl=MIN_INTERVAL_REVALIDASI, show_spinner=False)
+def load_data_from_url(url, sheet_names=(0,)):
+    # Satu unduhan untuk semua sheet; dikembalikan sebagai dict {sheet: DataFrame}.
     try:
-        url_no_cache = f"{url}&t={int(time.time())}"
-        df = pd.read_excel(url_no_cache, sheet_name=sheet_name)
-        return df
+        return load_workbook(url, sheet_names=sheet_names)
     except Exception as e:
-        st.error(f"Gagal memuat data dari URL (Sheet: {sheet_name}): {e}")
+        st.error(f"Gagal memuat data dari URL (Sheet: {', '.join(map(str, sheet_names))}): {e}")
         return None
 
-@st.cache_resource
-def get_selenium_driver():
-    options = Options()
-    options.add_argument("--disable-gpu")
-    options.add_argument("--headless")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
-    driver = webdriver.Chrome(options=options)
-    return driver
-
 @st.cache_resource
 def get_gspread_client():
     scope = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
@@ -140,123 +135,223 @@ def get_rentang_tanggal(tahun: int, triwulan: str, start_date=None, end_date=Non
     }
     return triwulan_map.get(triwulan, (None, None))
 
-def ekstrak_info_artikel(driver, link_google, keyword):
-    try:
-        driver.get(link_google)
-        time.sleep(2)
-        url_final = driver.current_url
-
-        if "google.com/url" in url_final or "consent.google.com" in url_final:
-            return None, "", ""
-
-        parsed_uri = urlparse(url_final)
-        sumber_dari_url = parsed_uri.netloc.replace('www.', '')
-
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
-
-        teks_artikel = " ".join(p.get_text(strip=True) for p in soup.find_all('p'))
-        if not teks_artikel:
-            return url_final, "", sumber_dari_url
-
-        kalimat_list = re.split(r'(?<=[.!?])\s+', teks_artikel)
-        ringkasan = ""
-
-        for kalimat in kalimat_list:
-            if keyword.lower() in kalimat.lower():
-                ringkasan = kalimat.strip()
-                break
-
-        if not ringkasan and kalimat_list:
-            ringkasan = kalimat_list[0].strip()
-
-        return url_final, ringkasan, sumber_dari_url
-    except Exception:
-        return None, "", ""
-
-def start_scraping(tanggal_awal, tanggal_akhir, kata_kunci_lapus_df, kata_kunci_daerah_df, start_time, status_placeholder, keyword_placeholder, table_placeholder, mode_ringkasan):
-    use_summary = (mode_ringkasan == "Dengan Ringkasan (cukup lama)")
-    driver = get_selenium_driver() if use_summary else None
-
-    kata_kunci_lapus_dict = {c: kata_kunci_lapus_df[c].dropna().astype(str).str.strip().tolist() for c in kata_kunci_lapus_df.columns}
-    nama_daerah = "Konawe Selatan"
-    kecamatan_list = kata_kunci_daerah_df[nama_daerah].dropna().astype(str).str.strip().tolist()
-    lokasi_filter = [nama_daerah.lower()] + [kec.lower() for kec in kecamatan_list]
-    gn = GoogleNews(lang='id', country='ID')
-
-    kolom_tabel = ["Nomor", "Kategori", "Kata Kunci", "Judul", "Link", "Tanggal", "Sumber"]
-    if use_summary:
-        kolom_tabel.append("Ringkasan")
-
-    semua_hasil = []
-    df_live = pd.DataFrame(columns=kolom_tabel)
-    total_kategori = len(kata_kunci_lapus_dict)
-
-    scraping_stopped = False
-    for kategori_ke, (kategori, kata_kunci_list) in enumerate(kata_kunci_lapus_dict.items(), 1):
-        for keyword_raw in kata_kunci_list:
-            if st.session_state.get('stop_scraping', False):
-                status_placeholder.warning("Proses dihentikan oleh pengguna.")
-                scraping_stopped = True
-                break
-
-            elapsed_time = time.time() - start_time
-            menit, detik = divmod(int(elapsed_time), 60)
-            status_placeholder.info(f"⏳ Proses Berjalan: {menit}m {detik}d | 📁 Kategori {kategori_ke}/{total_kategori}: {kategori}")
-
-            if pd.isna(keyword_raw): continue
-            keyword = str(keyword_raw).strip()
-            if not keyword: continue
-
-            keyword_placeholder.text(f"  ➡️ 🔍 Mencari: '{keyword}' di '{nama_daerah}'")
-            search_query = f'"{keyword}" "{nama_daerah}"'
-
-            try:
-                search_results = gn.search(search_query, from_=tanggal_awal, to_=tanggal_akhir)
-                for entry in search_results['entries']:
-                    if use_summary:
-                        link_final, ringkasan, sumber_dari_url = ekstrak_info_artikel(driver, entry.link, keyword)
-                    else:
-                        link_final, ringkasan, sumber_dari_url = entry.link, "", (entry.source.title if entry.source else "")
-
-                    if not link_final or any(d['Link'] == link_final for d in semua_hasil): continue
-
-                    judul_asli = entry.title
-                    judul_bersih, sumber_final = judul_asli, sumber_dari_url
-                    if ' - ' in judul_asli:
-                        parts = judul_asli.rsplit(' - ', 1)
-                        if len(parts) == 2 and parts[1].strip():
-                            judul_bersih, sumber_final = parts[0].strip(), parts[1].strip()
-
-                    judul_lower, ringkasan_lower = judul_bersih.lower(), ringkasan.lower()
-                    lokasi_ditemukan = any(loc in judul_lower or loc in ringkasan_lower for loc in lokasi_filter)
-                    keyword_ditemukan = keyword.lower() in judul_lower or keyword.lower() in ringkasan_lower
-
-                    if lokasi_ditemukan or keyword_ditemukan:
-                        try:
-                            tanggal_dt = datetime.strptime(entry.published, '%a, %d %b %Y %H:%M:%S %Z')
-                            tanggal_str = tanggal_dt.strftime('%d-%m-%Y')
-                        except (ValueError, TypeError):
-                            tanggal_str = "N/A"
-
-                        new_data = {"Nomor": len(semua_hasil) + 1, "Kategori": kategori, "Kata Kunci": keyword, "Judul": judul_bersih, "Link": link_final, "Tanggal": tanggal_str, "Sumber": sumber_final}
-                        if use_summary: new_data["Ringkasan"] = ringkasan
-
-                        semua_hasil.append(new_data)
-                        new_row_df = pd.DataFrame([new_data], columns=kolom_tabel)
-                        df_live = pd.concat([df_live, new_row_df], ignore_index=True)
-
-                        with table_placeholder.container():
-                            st.markdown("### Hasil Scraping (Live)")
-                            column_config = {"Link": st.column_config.LinkColumn("Link", width="medium")}
-                            if use_summary: column_config["Ringkasan"] = st.column_config.TextColumn("Ringkasan Penting", width="large")
-
-                            st.dataframe(df_live, use_container_width=True, height=500, column_config=column_config)
-                            st.caption(f"Total berita ditemukan: {len(df_live)}")
-            except Exception as e:
-                st.warning(f"Gagal mencari '{keyword}': {e}")
-                continue
-        if scraping_stopped: break
-    return pd.DataFrame(semua_hasil)
+def get_label_periode(params):
+    if params['triwulan'] == "Tanggal Custom":
+        start_str, end_str = params['start_date'].strftime('%Y%m%d'), params['end_date'].strftime('%Y%m%d')
+        return f"{start_str} s.d {end_str}"
+    return f"{params['triwulan']}_{params['tahun']}"
+
+@st.cache_resource
+def get_job_queue():
+    return JobQueue()
+
+@st.cache_resource
+def get_monitor_sets():
+    return MonitorSets()
+
+@st.cache_resource
+def get_article_store():
+    return ArticleStore()
+
+@st.cache_resource
+def get_watermark_store():
+    return WatermarkStore()
+
+def get_owner_id():
+    # Identitas pemilik job per browser; disimpan di URL agar tetap sama setelah refresh.
+    if 'owner_id' not in st.session_state:
+        st.session_state.owner_id = st.query_params.get('uid') or uuid.uuid4().hex[:8]
+    st.query_params['uid'] = st.session_state.owner_id
+    return st.session_state.owner_id
+
+def attach_job(job_id):
+    st.session_state.job_id = job_id
+    st.query_params['job'] = job_id
+
+def detach_job():
+    if 'job_id' in st.session_state: del st.session_state.job_id
+    if 'job' in st.query_params: del st.query_params['job']
+
+def pilih_hasil(job_id=None):
+    # Sesi hanya menyimpan ID run yang ditampilkan; barisnya tetap di antrean job dan diambil per halaman.
+    for key in [k for k in st.session_state if str(k).startswith('hasil_')]:
+        del st.session_state[key]
+    if job_id: st.session_state.hasil_job = job_id
+
+def submit_scraping_job(params, tanggal_awal, tanggal_akhir, df_daerah):
+    queue = get_job_queue()
+    payload = dict(params, df_daerah=df_daerah, tanggal_awal=tanggal_awal, tanggal_akhir=tanggal_akhir, periode=get_label_periode(params), bypass_cache=st.session_state.get('bypass_cache', False), sub_page=st.session_state.get('sub_page', 'Data'))
+    judul = f"{payload['sub_page']} · {payload['periode']} · {', '.join(map(str, params['df'].columns))}" + (" · delta" if params.get('mode_delta') else "")
+    job_id = queue.submit(get_owner_id(), judul, payload)
+    ensure_workers(queue)
+    return job_id
+
+def lanjutkan_job(job_id):
+    # Job dilanjutkan worker dari kata kunci terakhir yang tuntas (checkpoint).
+    queue = get_job_queue()
+    if queue.resume(job_id):
+        ensure_workers(queue)
+        pilih_hasil()
+        attach_job(job_id)
+
+def load_job_result(job_id):
+    # Metadata run saja; dibaca ulang tiap rerun sehingga memori sesi tidak bertambah dengan ukuran hasil.
+    queue = get_job_queue()
+    job, params = queue.get(job_id), queue.params(job_id)
+    if job is None: return None
+    params.pop('df_daerah', None)
+    progress = job['progress']
+    return {'params': params, 'job_id': job_id, 'status': job['status'], 'error': job['error'], 'selesai': job['selesai'], 'kolom': progress.get('kolom', []), 'jumlah': job['jumlah_baris'], 'attrs': atribut_hasil(progress)}
+
+def get_file_ekspor(result, fmt, kolom):
+    # Dibuat sekali per run (job + waktu selesai); rerun halaman memakai file yang sama di disk.
+    job_id = result['job_id']
+    kunci = f"{job_id}_{int((result.get('selesai') or 0) * 1000)}"
+    return ekspor(kunci, fmt, kolom, lambda: get_job_queue().iter_rows(job_id), result['attrs'].get('statistik'))
+
+def show_simpan_pemantauan(result):
+    # Set kata kunci run ini dapat dijalankan ulang mingguan (mode delta) lewat `python monitor.py`.
+    with st.expander("🛰️ Simpan sebagai Set Pemantauan"):
+        params = result['params']
+        nama = st.text_input("Nama set", value=f"{params.get('sub_page', 'Data')} · {', '.join(map(str, params['df'].columns))}", key="nama_set_pantau")
+        if st.button("💾 Simpan Set Pemantauan", use_container_width=True, key="simpan_set_pantau"):
+            df_daerah = (get_job_queue().params(result['job_id']) or {}).get('df_daerah')
+            get_monitor_sets().simpan(nama, {'df': params['df'], 'df_daerah': df_daerah, 'mode_ringkasan': params['mode_ringkasan'], 'mode_riwayat': params.get('mode_riwayat', "Tandai"), 'sub_page': params.get('sub_page', 'Data')})
+            st.success(f"Set '{nama}' disimpan. Jalankan dari sidebar atau terjadwal dengan `python monitor.py`.")
+
+def show_pemantauan_sidebar():
+    sets = get_monitor_sets()
+    with st.expander("🛰️ Pemantauan Terjadwal"):
+        stat = get_watermark_store().stats()
+        st.caption(f"Watermark: {stat['pasangan']:,} kata kunci | {stat['link']:,} link terlihat")
+        for s in sets.daftar():
+            terakhir = datetime.fromtimestamp(s['terakhir_jalan']).strftime('%d-%m-%Y %H:%M') if s['terakhir_jalan'] else "-"
+            st.write(f"**{s['nama']}** · terakhir: {terakhir}")
+            col1, col2, col3 = st.columns(3)
+            aktif = col1.toggle("Aktif", value=bool(s['aktif']), key=f"aktif_set_{s['id']}")
+            if aktif != bool(s['aktif']): sets.set_aktif(s['id'], aktif)
+            if col2.button("▶️", key=f"jalan_set_{s['id']}", help="Jalankan delta sekarang", use_container_width=True):
+                queue = get_job_queue()
+                job_ids = jadwalkan(queue, sets, [s['id']])
+                ensure_workers(queue)
+                if job_ids:
+                    pilih_hasil()
+                    attach_job(job_ids[0])
+                st.rerun()
+            if col3.button("🗑️", key=f"hapus_set_{s['id']}", help="Hapus set", use_container_width=True):
+                sets.hapus(s['id']); st.rerun()
+        st.caption("Jalankan terjadwal (mis. cron mingguan): `python monitor.py`")
+
+def tabel_statistik(statistik):
+    df = pd.DataFrame.from_dict(statistik or {}, orient='index')
+    if df.empty: return df
+    df.index.name = "Tahap"
+    return df.rename(columns={"jumlah": "Jumlah", "total_s": "Total (d)", "rata_ms": "Rata-rata (ms)", "p50_ms": "p50 (ms)", "p95_ms": "p95 (ms)", "maks_ms": "Maks (ms)"})
+
+def tabel_permintaan(permintaan):
+    df = pd.DataFrame.from_dict(permintaan or {}, orient='index')
+    if df.empty: return df
+    df.index.name = "Host"
+    df = df.sort_values("permintaan", ascending=False)
+    return df.rename(columns={"laju": "Laju (/d)", "sirkuit": "Sirkuit", "permintaan": "Permintaan", "berhasil": "Berhasil", "throttle": "Throttle (429)", "error_server": "Error 5xx", "error_koneksi": "Error Koneksi", "retry": "Retry", "sirkuit_dibuka": "Diistirahatkan"})
+
+def show_statistik_proses(statistik, permintaan=None):
+    if not statistik and not permintaan: return
+    with st.expander("📊 Statistik Proses"):
+        if statistik:
+            st.dataframe(tabel_statistik(statistik), use_container_width=True)
+            st.caption("Waktu per tahap pipeline. Tahap artikel berjalan paralel sehingga totalnya dapat melebihi durasi run.")
+        if permintaan:
+            st.markdown("##### Permintaan Keluar per Host")
+            st.dataframe(tabel_permintaan(permintaan), use_container_width=True)
+            st.caption("Laju per host naik perlahan selama sukses dan turun setengah saat throttle (429) atau error 5xx. Host yang terus gagal diistirahatkan sementara.")
+
+def get_column_config(kolom):
+    column_config = {"Link": st.column_config.LinkColumn("Link", width="medium")}
+    if "Ringkasan" in kolom: column_config["Ringkasan"] = st.column_config.TextColumn("Ringkasan Penting", width="large")
+    return column_config
+
+def show_tabel_hasil(result):
+    # Filter, urutan, dan paging dijalankan di SQLite; hanya satu halaman yang dikirim ke browser.
+    queue, job_id = get_job_queue(), result['job_id']
+    reset_halaman = lambda: st.session_state.update(hasil_halaman=1)
+    col1, col2, col3 = st.columns(3)
+    kategori = col1.multiselect("Kategori", [n for n, _ in queue.nilai_unik(job_id, "kategori")], key="hasil_kategori", on_change=reset_halaman)
+    jumlah_sumber = dict(queue.nilai_unik(job_id, "sumber"))
+    sumber = col2.multiselect("Sumber", list(jumlah_sumber), format_func=lambda s: f"{s} ({jumlah_sumber[s]})", key="hasil_sumber", on_change=reset_halaman)
+    tgl_min, tgl_maks = queue.rentang_tanggal(job_id)
+    rentang = ()
+    if tgl_min:
+        rentang = col3.date_input("Rentang tanggal terbit", value=(), min_value=date.fromisoformat(tgl_min), max_value=date.fromisoformat(tgl_maks), format="DD-MM-YYYY", key="hasil_tanggal", on_change=reset_halaman)
+    col1, col2, col3, col4 = st.columns([3, 2, 1, 1])
+    cari = col1.text_input("Cari teks", placeholder="Judul, sumber, ringkasan...", key="hasil_cari", on_change=reset_halaman)
+    urut = col2.selectbox("Urutkan", list(KOLOM_URUT), key="hasil_urut")
+    turun = col3.toggle("Menurun", key="hasil_turun")
+    ukuran = col4.selectbox("Per halaman", UKURAN_HALAMAN, index=1, key="hasil_ukuran", on_change=reset_halaman)
+    dari, sampai = (tuple(rentang) + (None, None))[:2]
+    rows, total, halaman = queue.halaman_rows(job_id, st.session_state.get('hasil_halaman', 1), ukuran, urut, turun, kategori, sumber, dari, sampai, cari.strip())
+    if not rows:
+        st.info("Tidak ada berita yang cocok dengan filter."); return
+    st.dataframe(pd.DataFrame(rows, columns=result['kolom']), use_container_width=True, height=min(500, 38 + 35 * len(rows)), hide_index=True, column_config=get_column_config(result['kolom']))
+    jumlah_halaman = -(-total // ukuran)
+    st.session_state.hasil_halaman = halaman
+    col1, col2 = st.columns([1, 4])
+    col1.number_input("Halaman", min_value=1, max_value=jumlah_halaman, step=1, key="hasil_halaman")
+    terfilter = f" (terfilter dari {result['jumlah']:,})" if total != result['jumlah'] else ""
+    col2.caption(f"Menampilkan {(halaman - 1) * ukuran + 1:,}–{(halaman - 1) * ukuran + len(rows):,} dari {total:,} berita{terfilter} · halaman {halaman} dari {jumlah_halaman}")
+
+@st.fragment(run_every=2)
+def show_job_panel(job_id):
+    queue = get_job_queue()
+    job = queue.get(job_id)
+    if job is None:
+        st.warning("Job tidak ditemukan."); detach_job(); return
+    if job['status'] not in STATUS_AKTIF:
+        pilih_hasil(job_id)
+        detach_job(); st.rerun()
+
+    col_header, col_button = st.columns([3, 1])
+    with col_header: st.header("Proses & Hasil Scraping")
+    with col_button:
+        st.markdown('<div class="stop-button">', unsafe_allow_html=True)
+        if st.button("🛑 Hentikan Proses", use_container_width=True, key="stop_button"):
+            queue.request_stop(job_id)
+        st.markdown('</div>', unsafe_allow_html=True)
+
+    progress = job['progress']
+    if job['status'] == STATUS_ANTRI:
+        st.info(f"🕒 Menunggu giliran worker (antrean ke-{queue.posisi_antrean(job_id)}). Anda boleh menutup halaman ini dan membukanya lagi lewat Daftar Job.")
+    elif progress.get('status'):
+        info = progress['status']
+        st.info(format_status(info))
+        st.text(f"  ➡️ 🔍 Mencari: '{info['keyword']}' di '{info['nama_daerah']}'")
+    for pesan in progress.get('peringatan', [])[-5:]:
+        st.warning(pesan)
+
+    # Tampilan live hanya memuat baris terbaru; hasil lengkap dapat dijelajahi per halaman setelah selesai.
+    rows = queue.rows_terakhir(job_id, BARIS_LIVE)
+    if rows:
+        t0 = time.time()
+        st.markdown("### Hasil Scraping (Live)")
+        st.dataframe(pd.DataFrame(rows, columns=progress.get('kolom')), use_container_width=True, height=500, column_config=get_column_config(progress.get('kolom', [])))
+        st.caption(f"Total berita ditemukan: {job['jumlah_baris']} | Menampilkan {len(rows)} terbaru | 🖼️ Render: {(time.time() - t0) * 1000:.0f} ms")
+        jalur = (progress.get('status') or {}).get('jalur')
+        if jalur:
+            st.caption(f"📦 Tersimpan: {jalur['tersimpan']} | 🌐 HTTP: {jalur['http']} | 🖥️ Selenium: {jalur['selenium']} | 🧬 Klaster: {jalur.get('klaster', 0)} | ❌ Gagal: {jalur['gagal']} — {jalur['tersimpan'] + jalur['http'] + jalur.get('klaster', 0)} pemuatan browser dihindari")
+    show_statistik_proses((progress.get('status') or {}).get('statistik'), (progress.get('status') or {}).get('permintaan'))
+
+def show_daftar_job():
+    jobs = get_job_queue().list_jobs(limit=10)
+    if not jobs: return
+    with st.expander("🗂️ Daftar Job Scraping"):
+        for job in jobs:
+            col1, col2, col3 = st.columns([5, 1, 1])
+            col1.write(f"**{job['judul']}** — {job['status']} · {job['jumlah_baris']} berita · {datetime.fromtimestamp(job['dibuat']).strftime('%d-%m-%Y %H:%M')}")
+            if col2.button("Buka", key=f"buka_job_{job['id']}", use_container_width=True):
+                pilih_hasil()
+                attach_job(job['id']); st.rerun()
+            if job['status'] in STATUS_DAPAT_DILANJUTKAN and col3.button("Lanjutkan", key=f"lanjut_job_{job['id']}", use_container_width=True):
+                lanjutkan_job(job['id']); st.rerun()
 
 # --- HALAMAN-HALAMAN APLIKASI ---
 def show_home_page():
@@ -375,8 +470,8 @@ def show_scraping_page():
     elif selected_topic == "Neraca":
         with st.spinner("Memuat data kategori & sub-kategori..."):
             base_url = "https://docs.google.com/spreadsheets/d/19FRmYvDvjhCGL3vDuOLJF54u7U7hnfic/export?format=xlsx"
-            df_kat = load_data_from_url(base_url, sheet_name='Sheet1_Kat')
-            df_subkat = load_data_from_url(base_url, sheet_name='Sheet1_SubKat')
+            sheets = load_data_from_url(base_url, sheet_names=('Sheet1_Kat', 'Sheet1_SubKat')) or {}
+            df_kat, df_subkat = sheets.get('Sheet1_Kat'), sheets.get('Sheet1_SubKat')
         if df_kat is None or df_subkat is None:
             st.error("Gagal memuat data. Pastikan sheet 'Sheet1_Kat' dan 'Sheet1_SubKat' ada di Google Sheet.")
         else:
@@ -394,6 +489,8 @@ def show_scraping_page():
                 end_date_input = col2.date_input("Tanggal Akhir", date.today(), key="end_date_neraca")
 
             mode_ringkasan = st.radio("Pilih Opsi Ringkasan:", ["Dengan Ringkasan (cukup lama)", "Tanpa Ringkasan (lebih cepat)"], horizontal=True, key="ringkasan_neraca")
+            mode_riwayat = st.radio("Artikel yang sudah ditemukan pada run sebelumnya:", ["Tandai", "Lewati"], horizontal=True, key="riwayat_neraca")
+            mode_delta = st.checkbox("Hanya berita baru sejak run terakhir (mode delta)", key="delta_neraca", help="Tiap kata kunci hanya dicari mulai dari berita terbaru yang pernah ditemukan; link yang sudah pernah terlihat tidak dimuat ulang.")
             mode_pencarian = st.radio("Pilih Mode Pencarian:", ["Kategori", "Sub Kategori"], horizontal=True, key="pencarian_neraca")
 
             kategori_terpilih = []
@@ -409,7 +506,7 @@ def show_scraping_page():
                     df_proses = df_kat[kategori_terpilih] if mode_pencarian == "Kategori" else df_subkat[kategori_terpilih]
                     st.session_state.start_scraping = True
                     st.session_state.sub_page = "Neraca"
-                    st.session_state.scraping_params = {'df': df_proses, 'tahun': tahun_input, 'triwulan': triwulan_input, 'start_date': start_date_input, 'end_date': end_date_input, 'mode_ringkasan': mode_ringkasan}
+                    st.session_state.scraping_params = {'df': df_proses, 'tahun': tahun_input, 'triwulan': triwulan_input, 'start_date': start_date_input, 'end_date': end_date_input, 'mode_ringkasan': mode_ringkasan, 'mode_riwayat': mode_riwayat, 'mode_delta': mode_delta}
                     st.rerun()
 
     elif selected_topic == "Lainnya":
@@ -424,6 +521,8 @@ def show_scraping_page():
             start_date_input_manual = col1.date_input("Tanggal Awal", date.today() - timedelta(days=30), key="start_date_manual")
             end_date_input_manual = col2.date_input("Tanggal Akhir", date.today(), key="end_date_manual")
         mode_ringkasan_manual = st.radio("Pilih Opsi Ringkasan:", ["Dengan Ringkasan (cukup lama)", "Tanpa Ringkasan (lebih cepat)"], horizontal=True, key="ringkasan_manual")
+        mode_riwayat_manual = st.radio("Artikel yang sudah ditemukan pada run sebelumnya:", ["Tandai", "Lewati"], horizontal=True, key="riwayat_manual")
+        mode_delta_manual = st.checkbox("Hanya berita baru sejak run terakhir (mode delta)", key="delta_manual")
         kata_kunci_manual = st.text_input("Masukkan kata kunci pencarian:", placeholder="Contoh: Bantuan Pangan", key="keyword_manual")
 
         is_disabled_manual = (triwulan_input_manual == "--Pilih Triwulan--")
@@ -433,7 +532,7 @@ def show_scraping_page():
                 df_proses = pd.DataFrame({kata_kunci_manual: [kata_kunci_manual]})
                 st.session_state.start_scraping = True
                 st.session_state.sub_page = "Lainnya"
-                st.session_state.scraping_params = {'df': df_proses, 'tahun': tahun_input, 'triwulan': triwulan_input_manual, 'start_date': start_date_input_manual, 'end_date': end_date_input_manual, 'mode_ringkasan': mode_ringkasan_manual}
+                st.session_state.scraping_params = {'df': df_proses, 'tahun': tahun_input, 'triwulan': triwulan_input_manual, 'start_date': start_date_input_manual, 'end_date': end_date_input_manual, 'mode_ringkasan': mode_ringkasan_manual, 'mode_riwayat': mode_riwayat_manual, 'mode_delta': mode_delta_manual}
                 st.rerun()
             elif not kata_kunci_manual.strip():
                    st.warning("Harap isi kata kunci terlebih dahulu.")
@@ -443,59 +542,70 @@ def show_scraping_page():
         tanggal_awal, tanggal_akhir = get_rentang_tanggal(params['tahun'], params['triwulan'], params['start_date'], params['end_date'])
         if tanggal_awal and tanggal_akhir:
             with st.spinner("Memuat data daerah..."):
-                df_daerah = load_data_from_url("https://docs.google.com/spreadsheets/d/1Y2SbHlWBWwcxCdAhHiIkdQmcmq--NkGk/export?format=xlsx")
+                df_daerah = (load_data_from_url("https://docs.google.com/spreadsheets/d/1Y2SbHlWBWwcxCdAhHiIkdQmcmq--NkGk/export?format=xlsx") or {}).get(0)
             if df_daerah is not None:
-                st.markdown("---")
-                col_header, col_button = st.columns([3, 1])
-                with col_header: st.header("Proses & Hasil Scraping")
-                with col_button:
-                    st.markdown('<div class="stop-button">', unsafe_allow_html=True)
-                    if st.button("🛑 Hentikan Proses", use_container_width=True, key="stop_button"):
-                        st.session_state.stop_scraping = True; st.rerun()
-                    st.markdown('</div>', unsafe_allow_html=True)
-                status_placeholder, keyword_placeholder, table_placeholder = st.empty(), st.empty(), st.empty()
-                hasil_df = start_scraping(tanggal_awal, tanggal_akhir, params['df'], df_daerah, time.time(), status_placeholder, keyword_placeholder, table_placeholder, mode_ringkasan=params['mode_ringkasan'])
-                status_placeholder.empty(); keyword_placeholder.empty()
-                st.session_state.scraping_result = {'df': hasil_df, 'params': params}
+                # Scraping dijalankan worker latar belakang; halaman ini hanya memantau.
+                pilih_hasil()
+                attach_job(submit_scraping_job(params, tanggal_awal, tanggal_akhir, df_daerah))
         del st.session_state.start_scraping
-        if 'stop_scraping' in st.session_state: del st.session_state.stop_scraping
         st.rerun()
 
-    if st.session_state.get('scraping_result'):
+    job_id = st.session_state.get('job_id') or st.query_params.get('job')
+    if job_id and not st.session_state.get('hasil_job'):
+        if st.session_state.get('job_id') != job_id: attach_job(job_id)
+        ensure_workers(get_job_queue())
+        st.markdown("---")
+        show_job_panel(job_id)
+    show_daftar_job()
+
+    result = load_job_result(st.session_state.hasil_job) if st.session_state.get('hasil_job') else None
+    if result:
         st.markdown("---"); st.header("✅ Proses Selesai")
-        result, hasil_df = st.session_state.scraping_result, st.session_state.scraping_result['df']
-        if not hasil_df.empty:
+        attrs = result['attrs']
+        if result.get('status') == STATUS_DIHENTIKAN:
+            st.warning("Proses dihentikan oleh pengguna.")
+        elif result.get('status') == STATUS_SEBAGIAN:
+            gagal = attrs.get('kata_kunci_gagal') or []
+            st.warning(f"{len(gagal)} kata kunci gagal dicari: {', '.join(map(str, gagal))}. Lanjutkan dari checkpoint untuk mencarinya lagi.")
+        elif result.get('status') in (STATUS_GAGAL, STATUS_TERPUTUS):
+            st.error(f"Proses tidak selesai ({result['status']}). {result.get('error') or ''} Hasil yang sempat ditemukan tetap ditampilkan.")
+        if result.get('status') in STATUS_DAPAT_DILANJUTKAN and result.get('job_id'):
+            if st.button("▶️ Lanjutkan dari Checkpoint", use_container_width=True, key="lanjutkan_job"):
+                lanjutkan_job(result['job_id']); st.rerun()
+        if result['jumlah']:
             st.markdown("#### Ringkasan Hasil Ditemukan")
             use_summary = (result['params']['mode_ringkasan'] == "Dengan Ringkasan (cukup lama)")
-            column_config = {"Link": st.column_config.LinkColumn("Link", width="medium")}
-            if use_summary: column_config["Ringkasan"] = st.column_config.TextColumn("Ringkasan Penting", width="large")
-            st.dataframe(hasil_df, use_container_width=True, height=500, column_config=column_config)
-            st.caption(f"Total {len(hasil_df)} berita ditemukan.")
+            st.caption(f"Total {result['jumlah']:,} berita ditemukan.")
+            show_tabel_hasil(result)
+            if 'waktu_scraping' in attrs:
+                st.caption(f"⏱️ Waktu scraping: {attrs['waktu_scraping']:.1f}d | 🖼️ Waktu render tabel live: {attrs['waktu_render']:.1f}d")
+            statistik = attrs.get('statistik')
+            show_statistik_proses(statistik, attrs.get('permintaan'))
             st.write("")
-            output = io.BytesIO()
-            with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                df_to_excel = hasil_df.copy()
-                if not use_summary and "Ringkasan" in df_to_excel.columns:
-                    df_to_excel = df_to_excel.drop(columns=["Ringkasan"])
-                df_to_excel.to_excel(writer, index=False, sheet_name="Hasil Scraping")
-            file_bytes = output.getvalue()
             params = result['params']
             now_str = datetime.now().strftime('%Y%m%d_%H%M%S')
-            topic_str = st.session_state.get('sub_page', 'Data')
-            if params['triwulan'] == "Tanggal Custom":
-                start_str, end_str = params['start_date'].strftime('%Y%m%d'), params['end_date'].strftime('%Y%m%d')
-                period_str = f"{start_str} s.d {end_str}"
-            else:
-                period_str = f"{params['triwulan']}_{params['tahun']}"
+            topic_str = params.get('sub_page', st.session_state.get('sub_page', 'Data'))
+            period_str = get_label_periode(params)
             kategori_list = params['df'].columns.tolist()
             kategori_str = ",".join(kategori_list)
             kategori_str = re.sub(r'[\\/*?:"<>|]', "", kategori_str)
-            filename = f"Hasil_Scraping_{topic_str}_{period_str}_{kategori_str}_{now_str}.xlsx"
-            st.download_button("📥 Unduh Hasil (Excel)", file_bytes, filename, "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", use_container_width=True, type="primary")
+            filename = f"Hasil_Scraping_{topic_str}_{period_str}_{kategori_str}_{now_str}"
+            kolom_ekspor = [k for k in result['kolom'] if use_summary or k != "Ringkasan"]
+            fmt = st.radio("Format unduhan", format_tersedia(), format_func=lambda f: FORMAT_EKSPOR[f][0], horizontal=True, key="format_ekspor")
+            label_fmt, mime = FORMAT_EKSPOR[fmt]
+            with st.spinner(f"Menyiapkan file {label_fmt}..."):
+                path_file = get_file_ekspor(result, fmt, kolom_ekspor)
+            with open(path_file, 'rb') as f:
+                st.download_button(f"📥 Unduh Hasil ({label_fmt})", f, f"{filename}.{fmt}", mime, use_container_width=True, type="primary")
+            if statistik:
+                laporan = {'job_id': result.get('job_id'), 'periode': period_str, 'status': result.get('status'), 'jumlah_berita': result['jumlah'], 'waktu_scraping': attrs.get('waktu_scraping'), 'waktu_render': attrs.get('waktu_render'), 'statistik': statistik, 'permintaan': attrs.get('permintaan')}
+                st.download_button("📊 Unduh Statistik Proses (JSON)", json.dumps(laporan, indent=2, ensure_ascii=False), f"{filename.replace('Hasil_Scraping_', 'Statistik_Proses_')}.json", "application/json", use_container_width=True)
         else:
             st.warning("Tidak ada berita yang ditemukan sesuai parameter yang dipilih.")
+            show_statistik_proses(attrs.get('statistik'), attrs.get('permintaan'))
+        if result.get('job_id'): show_simpan_pemantauan(result)
         if st.button("🔄 Mulai Scraping Baru (Reset)", use_container_width=True):
-            if 'scraping_result' in st.session_state: del st.session_state.scraping_result
+            pilih_hasil()
             st.rerun()
 
 # --- NAVIGASI DAN LOGIKA UTAMA ---
@@ -523,7 +633,19 @@ with st.sidebar:
             st.rerun()
 
     st.write("")
+    st.checkbox("Abaikan cache pencarian", key="bypass_cache", help="Selalu ambil hasil terbaru dari Google News (hasil tetap disimpan ke cache).")
+    kosongkan_cache = st.checkbox("Kosongkan cache pencarian saat reboot", key="purge_cache_on_reboot")
+    if st.session_state.logged_in:
+        with st.expander("📦 Penyimpanan Artikel"):
+            stat_artikel = get_article_store().stats()
+            st.caption(f"Entri: {stat_artikel['entri']:,} | Ukuran: {stat_artikel['bytes'] / (1024 * 1024):.1f} MB | Hit rate: {stat_artikel['hit_rate']:.0%} ({stat_artikel['hit']:,} hit / {stat_artikel['miss']:,} miss)")
+            if st.button("Kosongkan Penyimpanan Artikel", use_container_width=True):
+                get_article_store().purge(); st.rerun()
+        show_pemantauan_sidebar()
     if st.button("🔄 Reboot Aplikasi", use_container_width=True, help="Klik untuk membersihkan cache dan memulai ulang aplikasi jika terjadi masalah."):
+        if kosongkan_cache: SearchCache().purge()
+        get_job_queue().kirim_sinyal(SINYAL_DAUR_ULANG_BROWSER)  # worker menutup pool browsernya di antara job
+        hapus_semua_ekspor()
         st.cache_data.clear(); st.cache_resource.clear()
         st.success("Aplikasi sedang direboot...")
         time.sleep(2)
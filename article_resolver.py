@@ -0,0 +1,275 @@
+# --- RESOLVER ARTIKEL (HTTP DULU, SELENIUM SEBAGAI CADANGAN) ---
+# Link Google News diuraikan/diikuti dengan requests.Session yang di-pool
+# (keep-alive, gzip, timeout ketat). Browser hanya dipakai untuk link yang
+# memang membutuhkan JavaScript. Setiap artikel ditandai jalur penyelesaiannya.
+# Semua permintaan HTTP lewat pengatur permintaan keluar (lihat governor.py).
+
+import base64
+import codecs
+import json
+import re
+import threading
+from collections import namedtuple
+from urllib.parse import quote, urlparse
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+from governor import SirkuitTerbuka, get_governor
+from text_extractor import MAKS_BYTE_HTML, ekstrak_artikel, ekstrak_teks, pilih_ringkasan
+from telemetry import TAHAP_MUAT_BROWSER, TAHAP_MUAT_HTTP, TAHAP_PARSING, TAHAP_PENYIMPANAN, TAHAP_RESOLUSI, TAHAP_RINGKASAN, StageTimer
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+HTTP_TIMEOUT = (3.05, 8)
+MIN_PANJANG_TEKS = 200
+MAKS_ARTIKEL_PARALEL = 4
+# Artikel cukup dicoba ulang sekali; jalur browser masih menjadi cadangan.
+MAKS_PERCOBAAN_ARTIKEL = 2
+POLA_META_CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([\w.:-]+)""", re.I)
+
+JALUR_HTTP = "http"
+JALUR_SELENIUM = "selenium"
+JALUR_GAGAL = "gagal"
+JALUR_STORE = "tersimpan"
+JALUR_KLASTER = "klaster"  # anggota klaster berita hampir sama; ringkasan diambil dari wakilnya
+
+ArticleInfo = namedtuple("ArticleInfo", ["url_final", "ringkasan", "sumber", "jalur"])
+
+
+def buat_http_session(pool_size=20):
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({
+        "User-Agent": USER_AGENT,
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+        "Accept-Language": "id-ID,id;q=0.9,en;q=0.8",
+        "Accept-Encoding": "gzip, deflate",
+    })
+    # Lewati halaman persetujuan cookie Google.
+    session.cookies.set("CONSENT", "YES+", domain=".google.com")
+    return session
+
+
+def is_google_news_link(url):
+    return urlparse(url).netloc.endswith("news.google.com")
+
+
+def is_halaman_persetujuan(url):
+    return not url or "google.com/url" in url or "consent.google.com" in url
+
+
+def is_halaman_google(url):
+    return is_halaman_persetujuan(url) or is_google_news_link(url)
+
+
+def _artikel_id(link):
+    path = urlparse(link).path.split("/")
+    if len(path) > 1 and path[-2] in ("articles", "read"):
+        return path[-1]
+    return None
+
+
+def _decode_id_lama(artikel_id):
+    # Format lama: id berisi URL asli yang di-encode base64 (protobuf sederhana).
+    try:
+        raw = base64.urlsafe_b64decode(artikel_id + "=" * (-len(artikel_id) % 4))
+    except (ValueError, TypeError):
+        return None
+    prefix = b"\x08\x13\x22"
+    if raw.startswith(prefix):
+        raw = raw[len(prefix):]
+    if raw.endswith(b"\xd2\x01\x00"):
+        raw = raw[:-3]
+    if not raw:
+        return None
+    panjang = raw[0]
+    if panjang >= 0x80:
+        raw, panjang = raw[2:], (panjang & 0x7F) | (raw[1] << 7)
+    else:
+        raw = raw[1:]
+    kandidat = raw[:panjang].decode("utf-8", errors="ignore")
+    if kandidat.startswith("AU_yqL"):
+        return None  # Format baru, harus lewat batchexecute.
+    return kandidat if kandidat.startswith("http") else None
+
+
+def _decode_id_baru(artikel_id, session, timeout, governor):
+    # Format baru: ambil signature & timestamp dari halaman artikel lalu minta URL asli ke batchexecute.
+    resp = governor.get(session, f"https://news.google.com/rss/articles/{artikel_id}", timeout=timeout)
+    resp.raise_for_status()
+    soup = BeautifulSoup(resp.text, "html.parser")
+    node = soup.select_one("c-wiz > div[jscontroller]")
+    if node is None or not node.get("data-n-a-sg") or not node.get("data-n-a-ts"):
+        return None
+    payload = [
+        "Fbv4je",
+        f'["garturlreq",[["X","X",["X","X"],null,null,1,1,"US:en",null,1,null,null,null,null,null,0,1],"X","X",1,[1,1,1],1,1,null,0,0,null,0],"{artikel_id}",{node["data-n-a-ts"]},"{node["data-n-a-sg"]}"]',
+    ]
+    resp = governor.post(
+        session, "https://news.google.com/_/DotsSplashUi/data/batchexecute",
+        headers={"Content-Type": "application/x-www-form-urlencoded;charset=UTF-8"},
+        data=f"f.req={quote(json.dumps([[payload]]))}",
+        timeout=timeout,
+    )
+    resp.raise_for_status()
+    parsed = json.loads(resp.text.split("\n\n")[1])[:-2]
+    return json.loads(parsed[0][2])[1]
+
+
+def decode_google_news_url(link, session, timeout=HTTP_TIMEOUT, governor=None):
+    if not is_google_news_link(link):
+        return link
+    artikel_id = _artikel_id(link)
+    if not artikel_id:
+        return None
+    url = _decode_id_lama(artikel_id)
+    if url:
+        return url
+    try:
+        return _decode_id_baru(artikel_id, session, timeout, governor or get_governor())
+    except (requests.RequestException, SirkuitTerbuka, ValueError, IndexError, KeyError, TypeError):
+        return None
+
+
+def ambil_html(url, session, timeout=HTTP_TIMEOUT, maks_byte=MAKS_BYTE_HTML, governor=None):
+    # Body dibaca bertahap dan dipotong di `maks_byte`; sisa halaman raksasa tidak diunduh.
+    governor = governor or get_governor()
+    try:
+        with governor.get(session, url, maks_percobaan=MAKS_PERCOBAAN_ARTIKEL, timeout=timeout, allow_redirects=True, stream=True) as resp:
+            if resp.status_code >= 400 or "html" not in resp.headers.get("Content-Type", "html"):
+                return None, None
+            potongan, dibaca = [], 0
+            for chunk in resp.iter_content(chunk_size=64 * 1024):
+                potongan.append(chunk)
+                dibaca += len(chunk)
+                if dibaca >= maks_byte:
+                    break
+            data = b"".join(potongan)[:maks_byte]
+            return resp.url, data.decode(encoding_html(resp, data), errors="replace")
+    except (requests.RequestException, SirkuitTerbuka, LookupError):
+        return None, None
+
+
+def encoding_html(resp, data):
+    # Charset dari header; bila tidak ada (requests lalu menganggap ISO-8859-1), dari <meta> atau UTF-8
+    # yang valid, seperti browser. Tebakan `apparent_encoding` hanya sebagai upaya terakhir.
+    if "charset" in resp.headers.get("Content-Type", "").lower() and resp.encoding:
+        return resp.encoding
+    m = POLA_META_CHARSET.search(data[:4096])
+    if m:
+        try:
+            return codecs.lookup(m.group(1).decode("ascii")).name
+        except LookupError:
+            pass
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(data)  # akhir data boleh terpotong di tengah karakter
+        return "utf-8"
+    except UnicodeDecodeError:
+        return resp.apparent_encoding or "utf-8"
+
+
+def sumber_dari(url):
+    return urlparse(url).netloc.replace('www.', '')
+
+
+class ArticleResolver:
+    # `browser_fetch(link)` harus mengembalikan (url_final, page_source); hanya dipanggil bila HTTP gagal.
+    # `store` (opsional) menyimpan teks artikel sehingga artikel yang sama tidak dimuat dua kali.
+    # `timer` (opsional) mengumpulkan durasi per tahap (lihat telemetry.py).
+    def __init__(self, browser_fetch=None, session=None, timeout=HTTP_TIMEOUT, store=None, timer=None, governor=None):
+        self.session = session or buat_http_session()
+        self.governor = governor or get_governor()
+        self.browser_fetch = browser_fetch
+        self.timeout = timeout
+        self.store = store
+        self.timer = timer or StageTimer()
+        self.stats = {JALUR_STORE: 0, JALUR_HTTP: 0, JALUR_SELENIUM: 0, JALUR_GAGAL: 0, JALUR_KLASTER: 0}
+        self._lock = threading.Lock()
+
+    def _catat(self, jalur):
+        with self._lock:
+            self.stats[jalur] += 1
+
+    def _lewat_http(self, link, keyword):
+        with self.timer.span(TAHAP_RESOLUSI):
+            url = decode_google_news_url(link, self.session, self.timeout, self.governor)
+        if not url or is_halaman_google(url):
+            return None
+        with self.timer.span(TAHAP_MUAT_HTTP):
+            url_final, html = ambil_html(url, self.session, self.timeout, governor=self.governor)
+        if not html or is_halaman_google(url_final):
+            return None
+        teks, ringkasan = self._ekstrak(html, keyword)
+        # Teks terlalu pendek biasanya berarti konten dirender oleh JavaScript.
+        if ringkasan is None and len(teks) < MIN_PANJANG_TEKS:
+            return None
+        return url_final, teks, ringkasan
+
+    def _ekstrak(self, html, keyword):
+        # Tanpa store teks lengkap tidak diperlukan, sehingga parsing boleh berhenti di kalimat kata kunci.
+        # Ringkasan None berarti belum dipilih (dipilih dari teks oleh `_ringkas`).
+        with self.timer.span(TAHAP_PARSING):
+            if self.store is not None:
+                return ekstrak_teks(html), None
+            hasil = ekstrak_artikel(html, keyword)
+        return hasil.teks, (hasil.ringkasan if hasil.berhenti_awal else None)
+
+    def _lewat_browser(self, link, keyword):
+        if self.browser_fetch is None:
+            return None
+        try:
+            with self.timer.span(TAHAP_MUAT_BROWSER):
+                url_final, html = self.browser_fetch(link)
+        except Exception:
+            return None
+        if is_halaman_persetujuan(url_final):
+            return None
+        return (url_final, *self._ekstrak(html, keyword))
+
+    def _ringkas(self, teks, keyword):
+        with self.timer.span(TAHAP_RINGKASAN):
+            return pilih_ringkasan(teks, keyword)
+
+    def resolve(self, link, keyword):
+        with self.timer.span(TAHAP_PENYIMPANAN):
+            tersimpan = self.store.get(link) if self.store is not None else None
+        if tersimpan is not None:
+            url_final, sumber, teks = tersimpan
+            self._catat(JALUR_STORE)
+            return ArticleInfo(url_final, self._ringkas(teks, keyword), sumber, JALUR_STORE)
+
+        hasil, jalur = self._lewat_http(link, keyword), JALUR_HTTP
+        if hasil is None:
+            hasil, jalur = self._lewat_browser(link, keyword), JALUR_SELENIUM
+        if hasil is None:
+            self._catat(JALUR_GAGAL)
+            return ArticleInfo(None, "", "", JALUR_GAGAL)
+        url_final, teks, ringkasan = hasil
+        self._catat(jalur)
+        if self.store is not None and teks:
+            self.store.put(link, url_final, sumber_dari(url_final), teks)
+        if ringkasan is None:
+            ringkasan = self._ringkas(teks, keyword)
+        return ArticleInfo(url_final, ringkasan, sumber_dari(url_final), jalur)
+
+    def ringkas_ulang(self, wakil, keyword):
+        # Ringkasan wakil klaster untuk kata kunci lain dari teks tersimpan; None bila teksnya tidak ada.
+        if self.store is None or not wakil.url_final:
+            return None
+        with self.timer.span(TAHAP_PENYIMPANAN):
+            tersimpan = self.store.get(wakil.url_final)
+        if tersimpan is None:
+            return None
+        return wakil._replace(ringkasan=self._ringkas(tersimpan[2], keyword))
+
+    def dari_klaster(self, wakil, link, sumber):
+        # Halaman anggota klaster tidak dimuat; link dan sumbernya sendiri tetap dipakai.
+        self._catat(JALUR_KLASTER)
+        return ArticleInfo(link, wakil.ringkasan, sumber, JALUR_KLASTER)
+
+    @property
+    def browser_dihindari(self):
+        return self.stats[JALUR_HTTP] + self.stats[JALUR_STORE] + self.stats[JALUR_KLASTER]
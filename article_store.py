@@ -0,0 +1,116 @@
+# --- PENYIMPANAN ISI ARTIKEL ---
+# Teks paragraf artikel disimpan (terkompresi) per URL kanonik, sehingga artikel
+# yang muncul lagi di kata kunci, kategori, atau run lain cukup diringkas ulang
+# secara lokal tanpa memuat halaman. Ukuran dibatasi dengan eviksi LRU.
+
+import threading
+import time
+import zlib
+
+from dedupe import canonicalize_url
+from storage import buka_db
+
+MAKS_UKURAN_STORE = 512 * 1024 * 1024
+RASIO_SETELAH_EVIKSI = 0.9
+
+
+class ArticleStore:
+    def __init__(self, nama_db="artikel.sqlite", max_bytes=MAKS_UKURAN_STORE):
+        self._conn = buka_db(nama_db)
+        self._lock = threading.Lock()
+        self.max_bytes = max_bytes
+        self.hit = 0
+        self.miss = 0
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS artikel ("
+                " kanonik TEXT PRIMARY KEY, url_final TEXT, sumber TEXT, teks BLOB,"
+                " ukuran INTEGER, diambil REAL, diakses REAL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_artikel_diakses ON artikel (diakses)")
+            # Link Google News (dan varian lain) menunjuk ke artikel kanonik yang sama.
+            self._conn.execute("CREATE TABLE IF NOT EXISTS alias_artikel (alias TEXT PRIMARY KEY, kanonik TEXT)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_alias_kanonik ON alias_artikel (kanonik)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS statistik_artikel (nama TEXT PRIMARY KEY, nilai INTEGER)")
+
+    def _tambah_statistik(self, nama):
+        self._conn.execute(
+            "INSERT INTO statistik_artikel VALUES (?, 1) ON CONFLICT(nama) DO UPDATE SET nilai = nilai + 1", (nama,)
+        )
+
+    def _ubah_ukuran(self, selisih):
+        # Total byte tersimpan dicatat berjalan di statistik_artikel; SUM hanya untuk DB lama atau setelah purge.
+        row = self._conn.execute("SELECT nilai FROM statistik_artikel WHERE nama = 'ukuran'").fetchone()
+        total = (row[0] if row else self._conn.execute("SELECT COALESCE(SUM(ukuran), 0) FROM artikel").fetchone()[0]) + selisih
+        self._conn.execute("INSERT OR REPLACE INTO statistik_artikel VALUES ('ukuran', ?)", (total,))
+        return total
+
+    def get(self, link):
+        alias = canonicalize_url(link)
+        with self._lock, self._conn:
+            # Dua pencarian primary key; JOIN dengan OR memaksa SQLite memindai seluruh tabel.
+            row = self._conn.execute("SELECT kanonik FROM alias_artikel WHERE alias = ?", (alias,)).fetchone()
+            kanonik = row[0] if row else alias
+            row = self._conn.execute(
+                "SELECT kanonik, url_final, sumber, teks FROM artikel WHERE kanonik = ?", (kanonik,),
+            ).fetchone()
+            if row is None and kanonik != alias:
+                row = self._conn.execute("SELECT kanonik, url_final, sumber, teks FROM artikel WHERE kanonik = ?", (alias,)).fetchone()
+            if row is None:
+                self.miss += 1
+                self._tambah_statistik("miss")
+                return None
+            self.hit += 1
+            self._tambah_statistik("hit")
+            self._conn.execute("UPDATE artikel SET diakses = ? WHERE kanonik = ?", (time.time(), row[0]))
+        return row[1], row[2], zlib.decompress(row[3]).decode("utf-8")
+
+    def put(self, link, url_final, sumber, teks):
+        kanonik = canonicalize_url(url_final)
+        blob = zlib.compress(teks.encode("utf-8"), 6)
+        sekarang = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT ukuran FROM artikel WHERE kanonik = ?", (kanonik,)).fetchone()
+            total = self._ubah_ukuran(len(blob) - (row[0] if row else 0))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO artikel VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (kanonik, url_final, sumber, blob, len(blob), sekarang, sekarang),
+            )
+            alias = canonicalize_url(link)
+            if alias != kanonik:
+                self._conn.execute("INSERT OR REPLACE INTO alias_artikel VALUES (?, ?)", (alias, kanonik))
+            if total > self.max_bytes:
+                self._evict(total)
+
+    def _evict(self, total):
+        target = self.max_bytes * RASIO_SETELAH_EVIKSI
+        dibuang = []
+        for kanonik, ukuran in self._conn.execute("SELECT kanonik, ukuran FROM artikel ORDER BY diakses ASC"):
+            if total <= target:
+                break
+            dibuang.append((kanonik,))
+            total -= ukuran
+        self._conn.executemany("DELETE FROM artikel WHERE kanonik = ?", dibuang)
+        self._conn.executemany("DELETE FROM alias_artikel WHERE kanonik = ?", dibuang)
+        self._conn.execute("INSERT OR REPLACE INTO statistik_artikel VALUES ('ukuran', ?)", (total,))
+
+    def stats(self):
+        with self._lock:
+            entri = self._conn.execute("SELECT COUNT(*) FROM artikel").fetchone()[0]
+            total = dict(self._conn.execute("SELECT nama, nilai FROM statistik_artikel").fetchall())
+            if "ukuran" not in total:
+                total["ukuran"] = self._conn.execute("SELECT COALESCE(SUM(ukuran), 0) FROM artikel").fetchone()[0]
+        hit, miss = total.get("hit", 0), total.get("miss", 0)
+        return {
+            "entri": entri,
+            "bytes": total["ukuran"],
+            "hit": hit,
+            "miss": miss,
+            "hit_rate": hit / (hit + miss) if hit + miss else 0.0,
+        }
+
+    def purge(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM artikel")
+            self._conn.execute("DELETE FROM alias_artikel")
+            self._conn.execute("DELETE FROM statistik_artikel")
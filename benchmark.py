@@ -0,0 +1,499 @@
+# --- BENCHMARK OFFLINE ---
+# Menjalankan pipeline scraping terhadap server HTTP lokal pengganti Google News
+# dan situs berita, sehingga perubahan performa dapat diukur tanpa jaringan.
+# Server (proses terpisah) menyajikan feed RSS & HTML artikel, baik sintetis
+# maupun rekaman (--fixtures), dengan latensi dan error yang dapat diatur.
+# Laporan: kata kunci/detik, artikel/detik, p50/p95 per tahap (dari statistik
+# proses pipeline, lihat telemetry.py), dan RSS puncak.
+#
+# Contoh:
+#   python benchmark.py --workload neraca --ringkasan --latensi-rss-ms 150 --latensi-artikel-ms 80 --error 0.05
+#   python benchmark.py --fixtures rekaman/ --json hasil_bench.json
+#   python benchmark.py --ekstraksi [--fixtures rekaman/ --keyword "harga beras"]
+#   python benchmark.py --batas-rps 8 --error 0.02   # feed dibatasi server (429 + Retry-After)
+#
+# Mode --ekstraksi membandingkan ekstraksi teks + ringkasan lama (BeautifulSoup
+# seluruh <p>) dengan text_extractor pada halaman tersimpan, tanpa jaringan.
+#
+# Fixture rekaman: DIR/rss/*.xml (feed RSS mentah) dan DIR/artikel/*.html.
+# Link artikel di feed rekaman diarahkan ulang ke HTML rekaman secara bergiliran.
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import random
+import re
+import resource
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+from telemetry import persentil
+
+NAMA_DAERAH = "Konawe Selatan"
+KECAMATAN = [
+    "Andoolo", "Andoolo Barat", "Angata", "Baito", "Basala", "Benua", "Buke", "Kolono", "Kolono Timur",
+    "Konda", "Laeya", "Lainea", "Lalembuu", "Landono", "Laonti", "Mowila", "Moramo", "Moramo Utara",
+    "Palangga", "Palangga Selatan", "Ranomeeto", "Ranomeeto Barat", "Sabulakoa", "Tinanggea", "Wolasi",
+]
+# Kata kunci menyerupai sheet Neraca (kategori lapangan usaha).
+KATA_KUNCI_NERACA = {
+    "Pertanian": ["panen padi", "harga gabah", "pupuk subsidi", "tanam jagung", "irigasi sawah", "kakao", "peternakan sapi", "perikanan tangkap"],
+    "Pertambangan": ["tambang nikel", "izin usaha pertambangan", "smelter", "galian c", "tambang pasir", "reklamasi tambang"],
+    "Industri Pengolahan": ["pabrik kelapa sawit", "industri rumahan", "penggilingan padi", "pengolahan rumput laut", "umkm", "industri tahu tempe"],
+    "Konstruksi": ["pembangunan jalan", "jembatan", "proyek irigasi", "pembangunan pasar", "rehabilitasi sekolah", "dana desa"],
+    "Perdagangan": ["harga cabai", "pasar tradisional", "harga beras", "inflasi", "operasi pasar", "stok bahan pokok", "harga bbm"],
+    "Transportasi": ["pelabuhan", "angkutan umum", "jalan rusak", "kapal feri", "terminal"],
+    "Akomodasi": ["hotel", "rumah makan", "pariwisata", "festival budaya", "wisata pantai"],
+    "Pemerintahan": ["apbd", "bantuan sosial", "pelantikan kepala desa", "musrenbang", "penyaluran blt"],
+}
+WORKLOAD = {
+    "kecil": {k: v[:3] for k, v in list(KATA_KUNCI_NERACA.items())[:2]},
+    "neraca": KATA_KUNCI_NERACA,
+}
+SUMBER = ["Kendari Pos", "Zonasultra", "Telisik", "Sultrakini", "Antara Sultra", "Kompas", "Detik Sultra"]
+PERISTIWA = ["Sosialisasi", "Rapat Koordinasi", "Kunjungan Kerja", "Pelatihan", "Musyawarah Warga", "Peninjauan Lapangan", "Evaluasi Program", "Gotong Royong"]
+# Salinan rilis di media lain: judul sama dengan sedikit perubahan.
+VARIASI_JUDUL = [
+    lambda j: j.replace(NAMA_DAERAH, "Konsel"),
+    lambda j: f"VIDEO: {j}",
+    lambda j: f"{j} Hari Ini",
+    lambda j: j.replace(" di ", " di Kecamatan ", 1),
+]
+KALIMAT_ISI = [
+    "Pemerintah daerah terus memantau perkembangan di lapangan bersama instansi terkait.",
+    "Warga berharap program ini dapat berjalan berkelanjutan dan tepat sasaran.",
+    "Menurut data yang dihimpun, kegiatan serupa juga berlangsung di beberapa wilayah lain.",
+    "Kepala dinas menyampaikan bahwa anggaran telah disiapkan sejak awal tahun.",
+    "Sejumlah tokoh masyarakat turut hadir dalam kegiatan tersebut.",
+    "Pihaknya akan melakukan evaluasi secara berkala untuk memastikan capaian target.",
+]
+
+
+# --- SERVER PENGGANTI ---
+def _rng(*kunci):
+    return random.Random(hashlib.sha1("|".join(map(str, kunci)).encode("utf-8")).hexdigest())
+
+
+def _deskripsi(item):
+    judul = escape(item['judul'].rsplit(' - ', 1)[0])
+    return f'<a href="{escape(item["link"])}" target="_blank">{judul}</a>&nbsp;&nbsp;<font color="#6f6f6f">{escape(item["sumber"])}</font>'
+
+
+def _rss(items):
+    isi = "".join(
+        f"<item><title>{escape(i['judul'])}</title><link>{escape(i['link'])}</link><pubDate>{i['tanggal']}</pubDate>"
+        # Deskripsi seperti Google News: judul bertaut + nama media, tanpa potongan isi artikel.
+        f"<description>{escape(_deskripsi(i))}</description>"
+        f"<source url=\"https://{escape(i['sumber'].lower().replace(' ', ''))}.id\">{escape(i['sumber'])}</source></item>"
+        for i in items
+    )
+    return f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>Benchmark</title>{isi}</channel></rss>'
+
+
+class _Fixtures:
+    def __init__(self, config):
+        self.config = config
+        self.artikel = {}
+        self._lock = threading.Lock()
+        self.rss_rekaman, self.html_rekaman = [], []
+        if config.get("fixtures"):
+            folder = Path(config["fixtures"])
+            self.rss_rekaman = [p.read_text(encoding="utf-8") for p in sorted((folder / "rss").glob("*.xml"))]
+            self.html_rekaman = [p.read_text(encoding="utf-8", errors="ignore") for p in sorted((folder / "artikel").glob("*.html"))]
+
+    def feed(self, q, base):
+        kata_kunci = [k for k in re.findall(r'"([^"]+)"', q) if k != NAMA_DAERAH]
+        after = re.search(r"after:(\S+)", q)
+        before = re.search(r"before:(\S+)", q)
+        if self.rss_rekaman:
+            return self._feed_rekaman(q, base)
+        awal = datetime.strptime(after.group(1), "%Y-%m-%d") if after else datetime(2024, 1, 1)
+        akhir = datetime.strptime(before.group(1), "%Y-%m-%d") if before else awal + timedelta(days=90)
+        rentang = max(1, (akhir - awal).days)
+        items = []
+        # Artikel dibangkitkan per (kata kunci, hari) sehingga stabil antar jendela query:
+        # jendela yang lebih sempit (shard, mode delta) melihat subset artikel yang sama.
+        peluang = self.config["entri_per_kata_kunci"] / 270
+        for keyword in kata_kunci:
+            for hari in range(rentang):
+                tanggal_hari = awal + timedelta(days=hari)
+                rng = _rng(keyword, tanggal_hari.date())
+                for n in range(sum(rng.random() < peluang for _ in range(3))):
+                    # Sebagian artikel dipakai bersama antar kata kunci agar dedupe ikut bekerja.
+                    umum = rng.random() < 0.2
+                    artikel_id = hashlib.sha1(f"{'umum' if umum else keyword}|{tanggal_hari.date()}|{n}".encode()).hexdigest()[:16]
+                    kecamatan = rng.choice(KECAMATAN)
+                    sumber = rng.choice(SUMBER)
+                    pola = rng.random()
+                    if pola < 0.5:
+                        judul = f"{keyword.capitalize()} di {kecamatan} Meningkat Jelang Akhir Tahun - {sumber}"
+                    elif pola < 0.8:
+                        judul = f"Pemkab {NAMA_DAERAH} Bahas {keyword.capitalize()} - {sumber}"
+                    elif pola < 1 - self.config["rasio_isi_saja"]:
+                        judul = f"{rng.choice(PERISTIWA)} {keyword.capitalize()} di Sulawesi Tenggara - {sumber}"
+                    else:
+                        # Kata kunci hanya ada di isi artikel; judul/deskripsi cuma menyebut lokasi.
+                        judul = f"{rng.choice(PERISTIWA)} di Kecamatan {kecamatan} - {sumber}"
+                    tanggal = tanggal_hari + timedelta(hours=rng.randint(0, 23))
+                    salinan = [(artikel_id, judul, sumber, tanggal)]
+                    if rng.random() < self.config["rasio_salinan"]:
+                        for c, sumber_lain in enumerate(rng.sample([x for x in SUMBER if x != sumber], rng.randint(1, 3))):
+                            judul_lain = rng.choice(VARIASI_JUDUL)(judul.rsplit(" - ", 1)[0])
+                            salinan.append((f"{artikel_id}s{c}", f"{judul_lain} - {sumber_lain}", sumber_lain, tanggal + timedelta(hours=rng.randint(0, 30))))
+                    for artikel_id, judul, sumber, tanggal in salinan:
+                        with self._lock:
+                            self.artikel.setdefault(artikel_id, (judul.rsplit(" - ", 1)[0], keyword, kecamatan))
+                        items.append({"judul": judul, "link": f"{base}/artikel/{artikel_id}", "sumber": sumber, "waktu": tanggal,
+                                      "tanggal": format_datetime(tanggal.replace(tzinfo=timezone.utc), usegmt=True)})
+        # Feed terbaru lebih dulu, dipotong di batas feed Google News.
+        items.sort(key=lambda i: i["waktu"], reverse=True)
+        return _rss(items[:100])
+
+    def _feed_rekaman(self, q, base):
+        rng = _rng(q)
+        xml = self.rss_rekaman[rng.randrange(len(self.rss_rekaman))]
+        n = [0]
+
+        def ganti(m):
+            n[0] += 1
+            return f"<link>{base}/artikel/rekaman-{(rng.randrange(1 << 30) + n[0]) % max(1, len(self.html_rekaman))}</link>"
+        return re.sub(r"(?s)(?<=<item>)(.*?)</item>", lambda m: re.sub(r"<link>.*?</link>", ganti, m.group(0)), xml)
+
+    def html(self, artikel_id, dirender):
+        if artikel_id.startswith("rekaman-") and self.html_rekaman:
+            return self.html_rekaman[int(artikel_id.split("-", 1)[1]) % len(self.html_rekaman)]
+        judul, keyword, kecamatan = self.artikel.get(artikel_id, ("Artikel", "berita", KECAMATAN[0]))
+        rng = _rng(artikel_id)
+        navigasi = "".join(f'<li><a href="/kanal/{i}">Kanal {i}</a></li>' for i in range(40))
+        # Sebagian artikel hanya berisi kerangka; isinya baru ada setelah "JavaScript" (browser) dijalankan.
+        if not dirender and rng.random() < self.config["rasio_js"]:
+            isi = '<div id="app"></div><script src="/static/app.js"></script>'
+        else:
+            paragraf = [rng.choice(KALIMAT_ISI) for _ in range(rng.randint(6, 14))]
+            paragraf.insert(rng.randint(1, len(paragraf)), f"Kegiatan terkait {keyword} di Kecamatan {kecamatan}, {NAMA_DAERAH}, mendapat perhatian warga. {rng.choice(KALIMAT_ISI)}")
+            isi = "<article>" + "".join(f"<p>{p}</p>" for p in paragraf) + "</article>"
+        terkait = "".join(f'<p class="terkait"><a href="/artikel/x{i}">Baca juga berita lainnya {i}</a></p>' for i in range(8))
+        return (f"<!DOCTYPE html><html><head><title>{escape(judul)}</title>"
+                f"<script>{'var a=1;' * 400}</script></head><body><nav><ul>{navigasi}</ul></nav>"
+                f"<h1>{escape(judul)}</h1>{isi}<aside>{terkait}</aside><footer><p>Hak cipta redaksi.</p></footer></body></html>")
+
+
+def _jeda(rng, rata_ms):
+    if rata_ms > 0:
+        time.sleep(rata_ms * rng.lognormvariate(0, 0.5) / 1000)
+
+
+def _buat_handler(fixtures, config):
+    rng_lock = threading.Lock()
+    rng = random.Random(config["seed"])
+
+    def acak():
+        with rng_lock:
+            return random.Random(rng.random())
+
+    # Batas laju feed di sisi server (token bucket), meniru throttling Google News.
+    batas = {"lock": threading.Lock(), "token": config["batas_rps"], "waktu": time.monotonic()}
+
+    def dibatasi():
+        if not config["batas_rps"]:
+            return False
+        with batas["lock"]:
+            sekarang = time.monotonic()
+            batas["token"] = min(config["batas_rps"], batas["token"] + (sekarang - batas["waktu"]) * config["batas_rps"])
+            batas["waktu"] = sekarang
+            if batas["token"] < 1:
+                return True
+            batas["token"] -= 1
+            return False
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _kirim(self, status, body, content_type, headers=None):
+            data = body.encode("utf-8")
+            self.send_response(status)
+            for nama, nilai in (headers or {}).items():
+                self.send_header(nama, nilai)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            r = acak()
+            base = f"http://{self.headers.get('Host')}"
+            if url.path.startswith("/rss/search"):
+                if dibatasi():
+                    return self._kirim(429, "Too Many Requests", "text/plain", {"Retry-After": "1"})
+                _jeda(r, config["latensi_rss_ms"])
+                if r.random() < config["error"]:
+                    return self._kirim(503, "Service Unavailable", "text/plain")
+                q = parse_qs(url.query).get("q", [""])[0]
+                return self._kirim(200, fixtures.feed(q, base), "application/rss+xml; charset=utf-8")
+            if url.path.startswith("/artikel/"):
+                _jeda(r, config["latensi_artikel_ms"])
+                if r.random() < config["error_artikel"]:
+                    return self._kirim(r.choice((403, 500, 503)), "Error", "text/plain")
+                dirender = self.headers.get("X-Benchmark-Render") == "1"
+                return self._kirim(200, fixtures.html(url.path.rsplit("/", 1)[1], dirender), "text/html; charset=utf-8")
+            self._kirim(404, "Not Found", "text/plain")
+
+    return Handler
+
+
+def jalankan_server(config, antrean_port):
+    fixtures = _Fixtures(config)
+    server = ThreadingHTTPServer(("127.0.0.1", config.get("port", 0)), _buat_handler(fixtures, config))
+    server.daemon_threads = True
+    antrean_port.put(server.server_address[1])
+    server.serve_forever()
+
+
+# --- PENGGANTI BROWSER ---
+class DriverLokal:
+    # Meniru antarmuka WebDriver yang dipakai browser_pool; halaman diminta dalam versi "sudah dirender".
+    def __init__(self):
+        import requests
+        self._session = requests.Session()
+        self._session.headers["X-Benchmark-Render"] = "1"
+        self.current_url, self.page_source = "", ""
+
+    def set_page_load_timeout(self, detik):
+        pass
+
+    def execute_cdp_cmd(self, *args):
+        pass
+
+    def execute_script(self, script):
+        return "complete"
+
+    def get(self, url):
+        resp = self._session.get(url, timeout=20)
+        self.current_url, self.page_source = resp.url, resp.text
+
+    def quit(self):
+        self._session.close()
+
+
+# --- PENGUKURAN ---
+def rss_puncak_mb():
+    # ru_maxrss dalam KB di Linux, byte di macOS.
+    maks = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maks / (1024 * 1024) if sys.platform == "darwin" else maks / 1024
+
+
+def muat_kata_kunci(args):
+    if args.kata_kunci:
+        return pd.read_excel(args.kata_kunci, sheet_name=args.sheet)
+    return pd.DataFrame({k: pd.Series(v) for k, v in WORKLOAD[args.workload].items()})
+
+
+def jalankan_benchmark(args, base_url):
+    # Variabel lingkungan harus diset sebelum modul aplikasi diimpor.
+    os.environ["SKENA_GOOGLE_NEWS_URL"] = f"{base_url}/rss"
+    os.environ["SKENA_DATA_DIR"] = args.data_dir or tempfile.mkdtemp(prefix="skena_bench_")
+    import pipeline
+    from browser_pool import BrowserPool
+    from governor import ringkas_statistik
+
+    class ReporterBench(pipeline.Reporter):
+        def __init__(self):
+            self.peringatan = []
+
+        def warning(self, pesan):
+            self.peringatan.append(pesan)
+
+    if not args.chrome:
+        pipeline._browser_pool = BrowserPool(driver_factory=DriverLokal)
+
+    kata_kunci_df = muat_kata_kunci(args)
+    daerah_df = pd.DataFrame({NAMA_DAERAH: KECAMATAN})
+    mode = pipeline.MODE_DENGAN_RINGKASAN if args.ringkasan else "Tanpa Ringkasan (cepat)"
+    reporter = ReporterBench()
+    t0 = time.perf_counter()
+    hasil_df = pipeline.run_scrape(
+        args.awal, args.akhir, kata_kunci_df, daerah_df, mode, reporter=reporter, bypass_cache=True,
+        max_workers=args.workers, batch_query=not args.tanpa_batch, granularitas_shard=args.shard, mode_delta=args.delta,
+    )
+    durasi = time.perf_counter() - t0
+    jumlah_kata_kunci = int(kata_kunci_df.count().sum())
+    tahap = hasil_df.attrs.get("statistik", {})
+    jumlah_artikel = tahap.get("artikel", {}).get("jumlah", 0)
+    return {
+        "workload": args.kata_kunci or args.workload, "ringkasan": args.ringkasan, "delta": args.delta, "workers": args.workers,
+        "batch_query": not args.tanpa_batch, "shard": args.shard,
+        "latensi_rss_ms": args.latensi_rss_ms, "latensi_artikel_ms": args.latensi_artikel_ms,
+        "error": args.error, "error_artikel": args.error_artikel, "batas_rps": args.batas_rps,
+        "durasi_s": durasi, "kata_kunci": jumlah_kata_kunci, "artikel": jumlah_artikel, "baris_hasil": len(hasil_df),
+        "kata_kunci_per_detik": jumlah_kata_kunci / durasi if durasi else 0.0,
+        "artikel_per_detik": jumlah_artikel / durasi if durasi else 0.0,
+        "rss_puncak_mb": rss_puncak_mb(),
+        "tahap": tahap,
+        "permintaan": hasil_df.attrs.get("permintaan", {}),
+        "total_permintaan": ringkas_statistik(hasil_df.attrs.get("permintaan")),
+        "kata_kunci_gagal": len(hasil_df.attrs.get("kata_kunci_gagal", [])),
+        "jalur": hasil_df["Jalur"].value_counts().to_dict() if "Jalur" in hasil_df.columns else {},
+    }
+
+
+# --- PERBANDINGAN EKSTRAKSI ---
+def _ekstrak_lama(html, keyword):
+    # Implementasi sebelum text_extractor, disimpan sebagai pembanding.
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, 'html.parser')
+    teks = " ".join(p.get_text(strip=True) for p in soup.find_all('p'))
+    kalimat_list = re.split(r'(?<=[.!?])\s+', teks)
+    for kalimat in kalimat_list:
+        if keyword.lower() in kalimat.lower():
+            return kalimat.strip()
+    return kalimat_list[0].strip() if kalimat_list else ""
+
+
+def _ekstrak_baru(html, keyword):
+    from text_extractor import ekstrak_artikel
+    return ekstrak_artikel(html, keyword).ringkasan
+
+
+def halaman_uji(args):
+    # [(html, keyword)] dari fixture rekaman, atau halaman sintetis seukuran halaman berita sungguhan.
+    if args.fixtures:
+        return [(p.read_text(encoding="utf-8", errors="ignore"), args.keyword) for p in sorted((Path(args.fixtures) / "artikel").glob("*.html"))]
+    fixtures = _Fixtures({"rasio_js": 0.0})
+    halaman = []
+    for n in range(args.jumlah_halaman):
+        rng = _rng("halaman", n)
+        keyword = rng.choice([k for v in KATA_KUNCI_NERACA.values() for k in v])
+        artikel_id = f"uji{n}"
+        fixtures.artikel[artikel_id] = (f"Berita {keyword}", keyword, rng.choice(KECAMATAN))
+        html = fixtures.html(artikel_id, dirender=True)
+        pengisi = "".join(f'<div class="widget-populer"><p><a href="/x/{i}">Berita populer lain nomor {i} hari ini.</a></p></div>' for i in range(args.ukuran_halaman_kb * 4))
+        halaman.append((html.replace("<body>", f"<body><script>{'window.x=1;' * args.ukuran_halaman_kb * 40}</script>").replace("<footer>", pengisi + "<footer>"), keyword))
+    return halaman
+
+
+def _ukur(fn, halaman, ulang):
+    durasi, hasil = [], []
+    tracemalloc.start()
+    for html, keyword in halaman:
+        for _ in range(ulang):
+            t0 = time.perf_counter()
+            ringkasan = fn(html, keyword)
+            durasi.append(time.perf_counter() - t0)
+        hasil.append(ringkasan)
+    puncak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    urut = sorted(durasi)
+    return hasil, {"total_s": sum(urut), "p50_ms": persentil(urut, 50) * 1000, "p95_ms": persentil(urut, 95) * 1000, "memori_puncak_mb": puncak / 2 ** 20}
+
+
+def bandingkan_ekstraksi(args):
+    halaman = halaman_uji(args)
+    hasil_lama, lama = _ukur(_ekstrak_lama, halaman, args.ulang)
+    hasil_baru, baru = _ukur(_ekstrak_baru, halaman, args.ulang)
+    # Ringkasan baru dianggap setara bila memuat kalimat hasil cara lama.
+    setara = sum(1 for a, b in zip(hasil_lama, hasil_baru) if a and a in b)
+    ukuran = sum(len(h) for h, _ in halaman) / max(1, len(halaman)) / 1024
+    return {"halaman": len(halaman), "ukuran_rata_kb": ukuran, "ulang": args.ulang, "lama": lama, "baru": baru,
+            "percepatan": lama["total_s"] / baru["total_s"] if baru["total_s"] else 0.0,
+            "ringkasan_setara": setara, "ringkasan_lama_kosong": sum(1 for a in hasil_lama if not a)}
+
+
+def cetak_perbandingan(laporan):
+    print(f"Halaman      : {laporan['halaman']} × {laporan['ulang']} (rata-rata {laporan['ukuran_rata_kb']:.0f} KB)")
+    print(f"{'Ekstraksi':<12}{'total (d)':>11}{'p50 (ms)':>11}{'p95 (ms)':>11}{'memori (MB)':>13}")
+    for nama in ("lama", "baru"):
+        t = laporan[nama]
+        print(f"{nama:<12}{t['total_s']:>11.2f}{t['p50_ms']:>11.1f}{t['p95_ms']:>11.1f}{t['memori_puncak_mb']:>13.1f}")
+    print(f"Percepatan   : {laporan['percepatan']:.1f}x | ringkasan setara: {laporan['ringkasan_setara']}/{laporan['halaman']}")
+
+
+def cetak_laporan(laporan):
+    print(f"Workload     : {laporan['workload']} ({laporan['kata_kunci']} kata kunci, ringkasan={laporan['ringkasan']})")
+    print(f"Durasi       : {laporan['durasi_s']:.2f} d | hasil {laporan['baris_hasil']} baris")
+    print(f"Throughput   : {laporan['kata_kunci_per_detik']:.2f} kata kunci/d | {laporan['artikel_per_detik']:.2f} artikel/d")
+    print(f"RSS puncak   : {laporan['rss_puncak_mb']:.1f} MB")
+    if laporan["jalur"]:
+        print(f"Jalur        : {laporan['jalur']}")
+    total = laporan["total_permintaan"]
+    print(f"Permintaan   : {total['permintaan']} | throttle {total['throttle']} | error 5xx {total['error_server']} | retry {total['retry']}"
+          f" | diistirahatkan {total['sirkuit_dibuka']} | kata kunci gagal {laporan['kata_kunci_gagal']}")
+    print(f"{'Tahap':<22}{'jumlah':>8}{'total (d)':>11}{'p50 (ms)':>11}{'p95 (ms)':>11}")
+    for nama, t in laporan["tahap"].items():
+        print(f"{nama:<22}{t['jumlah']:>8}{t['total_s']:>11.2f}{t['p50_ms']:>11.1f}{t['p95_ms']:>11.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark offline pipeline scraping SKENA")
+    parser.add_argument("--workload", choices=sorted(WORKLOAD), default="neraca")
+    parser.add_argument("--kata-kunci", default=None, help="File Excel kata kunci (mis. salinan sheet Neraca)")
+    parser.add_argument("--sheet", default="Sheet1_Kat")
+    parser.add_argument("--fixtures", default=None, help="Folder berisi rss/*.xml dan artikel/*.html rekaman")
+    parser.add_argument("--awal", default="2024-01-01")
+    parser.add_argument("--akhir", default="2024-03-31")
+    parser.add_argument("--ringkasan", action="store_true", help="Jalankan mode dengan ringkasan (memuat artikel)")
+    parser.add_argument("--workers", type=int, default=6)
+    parser.add_argument("--tanpa-batch", action="store_true")
+    parser.add_argument("--shard", default="bulanan", choices=["bulanan", "mingguan", "tanpa"])
+    parser.add_argument("--latensi-rss-ms", type=float, default=150)
+    parser.add_argument("--latensi-artikel-ms", type=float, default=80)
+    parser.add_argument("--error", type=float, default=0.0, help="Peluang respons 503 untuk feed")
+    parser.add_argument("--batas-rps", type=float, default=0.0, help="Batas laju feed di server (429 bila terlampaui); 0 = tanpa batas")
+    parser.add_argument("--error-artikel", type=float, default=0.0, help="Peluang respons error untuk artikel")
+    parser.add_argument("--rasio-js", type=float, default=0.1, help="Porsi artikel yang butuh browser")
+    parser.add_argument("--entri-per-kata-kunci", type=int, default=15)
+    parser.add_argument("--rasio-salinan", type=float, default=0.25, help="Porsi berita yang dimuat ulang 1-3 media lain (judul sedikit berbeda)")
+    parser.add_argument("--rasio-isi-saja", type=float, default=0.1, help="Porsi berita yang kata kuncinya hanya ada di isi artikel")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--chrome", action="store_true", help="Pakai Chrome sungguhan untuk jalur browser")
+    parser.add_argument("--data-dir", default=None, help="Folder data (pakai ulang untuk mengukur run kedua/delta)")
+    parser.add_argument("--delta", action="store_true", help="Mode delta (hanya berita baru sejak watermark)")
+    parser.add_argument("--port", type=int, default=0, help="Port server tiruan; samakan antar run agar link artikel stabil (mode delta)")
+    parser.add_argument("--json", default=None, help="Simpan laporan ke file JSON")
+    parser.add_argument("--ekstraksi", action="store_true", help="Bandingkan ekstraksi teks lama vs baru saja")
+    parser.add_argument("--keyword", default=NAMA_DAERAH, help="Kata kunci untuk halaman rekaman (mode --ekstraksi)")
+    parser.add_argument("--jumlah-halaman", type=int, default=50)
+    parser.add_argument("--ukuran-halaman-kb", type=int, default=200)
+    parser.add_argument("--ulang", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.ekstraksi:
+        laporan = bandingkan_ekstraksi(args)
+        cetak_perbandingan(laporan)
+        if args.json:
+            Path(args.json).write_text(json.dumps(laporan, indent=2, ensure_ascii=False), encoding="utf-8")
+        sys.exit(0)
+
+    config = {
+        "fixtures": args.fixtures, "seed": args.seed, "latensi_rss_ms": args.latensi_rss_ms,
+        "latensi_artikel_ms": args.latensi_artikel_ms, "error": args.error, "error_artikel": args.error_artikel,
+        "rasio_js": args.rasio_js, "entri_per_kata_kunci": args.entri_per_kata_kunci, "port": args.port, "batas_rps": args.batas_rps, "rasio_salinan": args.rasio_salinan,
+        "rasio_isi_saja": args.rasio_isi_saja,
+    }
+    # Server di proses terpisah agar RSS puncak hanya mencerminkan pipeline.
+    antrean_port = multiprocessing.Queue()
+    server = multiprocessing.Process(target=jalankan_server, args=(config, antrean_port), daemon=True)
+    server.start()
+    try:
+        laporan = jalankan_benchmark(args, f"http://127.0.0.1:{antrean_port.get(timeout=10)}")
+    finally:
+        server.terminate()
+    cetak_laporan(laporan)
+    if args.json:
+        Path(args.json).write_text(json.dumps(laporan, indent=2, ensure_ascii=False), encoding="utf-8")
@@ -0,0 +1,184 @@
+# --- POOL BROWSER HEADLESS ---
+# Sejumlah terbatas driver Chrome yang dipinjam (lease) dan dikembalikan oleh
+# setiap proses scraping, sehingga beberapa sesi pengguna tidak lagi berebut satu
+# driver. Driver didaur ulang setelah N halaman atau bila crash/tidak sehat.
+
+import atexit
+import queue
+import threading
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.support.ui import WebDriverWait
+
+from article_resolver import USER_AGENT, is_google_news_link
+
+UKURAN_POOL_BROWSER = 3
+MAKS_HALAMAN_PER_DRIVER = 50
+BATAS_WAKTU_MUAT = 20
+BATAS_WAKTU_REDIRECT = 10
+
+# Sumber daya yang tidak diperlukan untuk membaca teks artikel.
+POLA_DIBLOKIR = [
+    "*.css", "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.mp4", "*.webm",
+]
+
+
+def buat_driver():
+    options = Options()
+    options.add_argument("--disable-gpu")
+    options.add_argument("--headless")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument(f'user-agent={USER_AGENT}')
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.managed_default_content_settings.stylesheets": 2,
+        "profile.managed_default_content_settings.fonts": 2,
+    })
+    options.page_load_strategy = "eager"
+    driver = webdriver.Chrome(options=options)
+    driver.set_page_load_timeout(BATAS_WAKTU_MUAT)
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": POLA_DIBLOKIR})
+    except WebDriverException:
+        pass
+    return driver
+
+
+def muat_halaman(driver, link_google, batas_redirect=BATAS_WAKTU_REDIRECT):
+    # Pengganti `time.sleep(2)`: tunggu hingga redirect Google News benar-benar mendarat.
+    try:
+        driver.get(link_google)
+    except TimeoutException:
+        pass
+    try:
+        WebDriverWait(driver, batas_redirect, poll_frequency=0.2).until(
+            lambda d: not is_google_news_link(d.current_url)
+            and d.execute_script("return document.readyState") in ("interactive", "complete")
+        )
+    except TimeoutException:
+        pass
+    return driver.current_url, driver.page_source
+
+
+class _Slot:
+    def __init__(self, driver):
+        self.driver = driver
+        self.halaman = 0
+
+
+class BrowserPool:
+    def __init__(self, size=UKURAN_POOL_BROWSER, max_pages=MAKS_HALAMAN_PER_DRIVER, driver_factory=buat_driver, lease_timeout=120):
+        self.size = size
+        self.max_pages = max_pages
+        self.driver_factory = driver_factory
+        self.lease_timeout = lease_timeout
+        self._idle = queue.LifoQueue()
+        self._sem = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._aktif = set()
+        self.stats = {"dibuat": 0, "didaur_ulang": 0, "crash": 0, "halaman": 0}
+        atexit.register(self.close_all)
+
+    def _catat(self, kunci, n=1):
+        with self._lock:
+            self.stats[kunci] += n
+
+    def _sehat(self, driver):
+        try:
+            driver.execute_script("return 1")
+            return True
+        except WebDriverException:
+            return False
+
+    def _buat_slot(self):
+        slot = _Slot(self.driver_factory())
+        with self._lock:
+            self._aktif.add(slot)
+            self.stats["dibuat"] += 1
+        return slot
+
+    def _buang(self, slot):
+        with self._lock:
+            self._aktif.discard(slot)
+        try:
+            slot.driver.quit()
+        except Exception:
+            pass
+
+    def _ambil_slot(self):
+        while True:
+            try:
+                slot = self._idle.get_nowait()
+            except queue.Empty:
+                slot = self._buat_slot()
+                break
+            if self._sehat(slot.driver):
+                break
+            self._catat("crash")
+            self._buang(slot)
+        return slot
+
+    @contextmanager
+    def lease(self):
+        if not self._sem.acquire(timeout=self.lease_timeout):
+            raise TimeoutError("Semua browser sedang dipakai.")
+        slot = None
+        try:
+            slot = self._ambil_slot()
+            yield slot.driver
+            slot.halaman += 1
+            self._catat("halaman")
+        except Exception:
+            if slot is not None:
+                self._catat("crash")
+                self._buang(slot)
+                slot = None
+            raise
+        finally:
+            if slot is not None:
+                if slot.halaman >= self.max_pages:
+                    self._catat("didaur_ulang")
+                    self._buang(slot)
+                else:
+                    self._idle.put(slot)
+            self._sem.release()
+
+    def health_check(self):
+        # Buang driver idle yang sudah tidak merespons; kembalikan jumlah driver sehat.
+        sehat = []
+        while True:
+            try:
+                slot = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if self._sehat(slot.driver):
+                sehat.append(slot)
+            else:
+                self._catat("crash")
+                self._buang(slot)
+        for slot in sehat:
+            self._idle.put(slot)
+        return len(sehat)
+
+    def close_all(self):
+        while True:
+            try:
+                self._idle.get_nowait()
+            except queue.Empty:
+                break
+        with self._lock:
+            semua = list(self._aktif)
+        for slot in semua:
+            self._buang(slot)
+
+    def fetch(self, link_google):
+        with self.lease() as driver:
+            return muat_halaman(driver, link_google)
@@ -0,0 +1,103 @@
+# --- DEDUPLIKASI LINK ---
+# URL dinormalkan (kanonik) sehingga varian yang hanya berbeda parameter pelacak,
+# versi AMP, `www.` atau garis miring di akhir dianggap artikel yang sama.
+# Indeks berbasis dict membuat pengecekan duplikat O(1).
+
+import threading
+from datetime import datetime
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from storage import buka_db
+
+PARAM_PELACAK = {
+    "fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid",
+    "ref", "ref_src", "referrer", "oc", "ved", "usg", "amp", "outputtype",
+    "_ga", "_gl", "cmpid", "spm", "s_cid",
+}
+PREFIX_PELACAK = ("utm_", "at_", "pk_", "hsa_")
+PREFIX_HOST = ("www.", "m.", "amp.", "mobile.")
+
+
+def canonicalize_url(url):
+    if not url:
+        return ""
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port  # port bukan angka/di luar rentang -> ValueError
+    except ValueError:
+        return url.strip()
+    host = (parts.hostname or "").lower()
+    for prefix in PREFIX_HOST:
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+    if port and port not in (80, 443):
+        host = f"{host}:{port}"
+
+    path = parts.path or "/"
+    segmen = [s for s in path.split("/") if s]
+    segmen = [s for s in segmen if s.lower() != "amp"]
+    if segmen and segmen[-1].lower().endswith(".amp"):
+        segmen[-1] = segmen[-1][:-4]
+    path = "/" + "/".join(segmen)
+
+    query = [
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in PARAM_PELACAK and not k.lower().startswith(PREFIX_PELACAK)
+    ]
+    query.sort()
+    return urlunsplit(("https", host, path, urlencode(query), ""))
+
+
+class LinkIndex:
+    def __init__(self):
+        self._index = {}
+
+    def __contains__(self, url):
+        return canonicalize_url(url) in self._index
+
+    def __len__(self):
+        return len(self._index)
+
+    def get(self, url):
+        return self._index.get(canonicalize_url(url))
+
+    def add(self, url, nilai=True):
+        kunci = canonicalize_url(url)
+        if kunci in self._index:
+            return False
+        self._index[kunci] = nilai
+        return True
+
+
+class LinkHistory:
+    # Riwayat link yang pernah dihasilkan pada run sebelumnya (persisten, SQLite).
+    def __init__(self, nama_db="riwayat_link.sqlite"):
+        self._conn = buka_db(nama_db)
+        self._lock = threading.Lock()
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS riwayat_link ("
+            " kanonik TEXT PRIMARY KEY, url TEXT, periode TEXT, pertama_dilihat TEXT)"
+        )
+
+    def periode_pertama(self, url):
+        with self._lock:
+            row = self._conn.execute("SELECT periode FROM riwayat_link WHERE kanonik = ?", (canonicalize_url(url),)).fetchone()
+        return row[0] if row else None
+
+    def __contains__(self, url):
+        return self.periode_pertama(url) is not None
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM riwayat_link").fetchone()[0]
+
+    def simpan(self, urls, periode):
+        waktu = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        rows = [(canonicalize_url(u), u, periode, waktu) for u in urls if u]
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR IGNORE INTO riwayat_link VALUES (?, ?, ?, ?)", rows)
+
+    def hapus_semua(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM riwayat_link")
@@ -0,0 +1,135 @@
+# --- EKSPOR HASIL ---
+# File unduhan dibuat sekali per run (dikunci oleh ID job + waktu selesai) dan
+# disimpan di disk, lalu dipakai ulang pada setiap rerun halaman. Baris ditulis
+# bertahap dari potongan-potongan hasil sehingga memori tetap datar: Excel lewat
+# openpyxl mode write-only, CSV lewat modul csv, Parquet lewat ParquetWriter.
+
+import csv
+import glob
+import os
+import tempfile
+import time
+
+from openpyxl import Workbook
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+from storage import data_path
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet hanya tersedia bila pyarrow terpasang.
+    pa = pq = None
+
+FORMAT_XLSX = "xlsx"
+FORMAT_CSV = "csv"
+FORMAT_PARQUET = "parquet"
+FORMAT_EKSPOR = {
+    FORMAT_XLSX: ("Excel", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    FORMAT_CSV: ("CSV", "text/csv"),
+    FORMAT_PARQUET: ("Parquet", "application/vnd.apache.parquet"),
+}
+KOLOM_STATISTIK = ["jumlah", "total_s", "rata_ms", "p50_ms", "p95_ms", "maks_ms"]
+KOLOM_BILANGAN = {"Nomor", "Klaster", "Ukuran Klaster"}
+# Versi lama baru dihapus setelah masa tenggang, agar unduhan yang sedang berjalan di sesi lain tidak terputus.
+MASA_TENGGANG_S = 15 * 60
+
+
+def format_tersedia():
+    return [f for f in FORMAT_EKSPOR if f != FORMAT_PARQUET or pq is not None]
+
+
+def _bersihkan(nilai):
+    if isinstance(nilai, str):
+        return ILLEGAL_CHARACTERS_RE.sub("", nilai)
+    return nilai
+
+
+def tulis_xlsx(path, kolom, batches, statistik=None):
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Hasil Scraping")
+    ws.append(kolom)
+    for batch in batches:
+        for row in batch:
+            ws.append([_bersihkan(row.get(k, "")) for k in kolom])
+    if statistik:
+        ws_stat = wb.create_sheet("Statistik Proses")
+        ws_stat.append(["Tahap"] + KOLOM_STATISTIK)
+        for tahap, nilai in statistik.items():
+            ws_stat.append([tahap] + [nilai.get(k) for k in KOLOM_STATISTIK])
+    wb.save(path)
+
+
+def tulis_csv(path, kolom, batches, statistik=None):
+    # utf-8-sig agar Excel langsung mengenali encoding.
+    with open(path, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.writer(f)
+        writer.writerow(kolom)
+        for batch in batches:
+            writer.writerows([row.get(k, "") for k in kolom] for row in batch)
+
+
+def _nilai_parquet(kolom, nilai):
+    if kolom in KOLOM_BILANGAN:
+        return None if nilai is None or nilai == "" else int(nilai)
+    return None if nilai is None else str(nilai)
+
+
+def tulis_parquet(path, kolom, batches, statistik=None):
+    schema = pa.schema([(k, pa.int64() if k in KOLOM_BILANGAN else pa.string()) for k in kolom])
+    with pq.ParquetWriter(path, schema, compression="zstd") as writer:
+        for batch in batches:
+            data = {k: [_nilai_parquet(k, row.get(k)) for row in batch] for k in kolom}
+            writer.write_table(pa.Table.from_pydict(data, schema=schema))
+
+
+PENULIS = {FORMAT_XLSX: tulis_xlsx, FORMAT_CSV: tulis_csv, FORMAT_PARQUET: tulis_parquet}
+
+
+def path_ekspor(kunci, fmt):
+    return data_path(os.path.join("ekspor", f"{kunci}.{fmt}"))
+
+
+def ekspor(kunci, fmt, kolom, sumber_batch, statistik=None):
+    # `kunci`: "<job_id>_<versi>"; `sumber_batch()` menghasilkan potongan baris (list of dict).
+    # Mengembalikan path file; file yang sudah ada tidak dibuat ulang.
+    os.makedirs(data_path("ekspor"), exist_ok=True)
+    path = path_ekspor(kunci, fmt)
+    if os.path.exists(path):
+        return path
+    # Nama sementara unik per penulis; sesi lain yang membuat file yang sama menulis ke filenya sendiri.
+    fd, sementara = tempfile.mkstemp(dir=os.path.dirname(path), prefix=f"{kunci}.", suffix=f".{fmt}.tmp")
+    os.close(fd)
+    try:
+        PENULIS[fmt](sementara, list(kolom), sumber_batch(), statistik)
+        os.replace(sementara, path)
+    finally:
+        if os.path.exists(sementara):
+            os.remove(sementara)
+    _pangkas(kunci, fmt, path)
+    return path
+
+
+def _pangkas(kunci, fmt, path):
+    # Versi lama dari job yang sama (mis. sebelum dilanjutkan) sudah tidak berlaku; juga sisa file
+    # sementara dari penulis yang terhenti.
+    awalan = kunci.rsplit("_", 1)[0]
+    batas = time.time() - MASA_TENGGANG_S
+    for lama in glob.glob(path_ekspor(f"{awalan}_*", fmt)) + glob.glob(path_ekspor(f"{awalan}_*", f"{fmt}.tmp")):
+        try:
+            if lama != path and os.path.getmtime(lama) < batas:
+                os.remove(lama)
+        except FileNotFoundError:
+            pass
+
+
+def hapus_semua():
+    jumlah = 0
+    for fmt in FORMAT_EKSPOR:
+        for path in glob.glob(path_ekspor("*", fmt)):
+            try:
+                os.remove(path)
+                jumlah += 1
+            except FileNotFoundError:
+                pass
+    return jumlah
@@ -0,0 +1,41 @@
+# --- FEED PENCARIAN GOOGLE NEWS ---
+# Pengganti `GoogleNews.search` (pygooglenews) yang hanya mengambil feed sekali
+# per query dan lewat pengatur permintaan keluar, sehingga 429/5xx dari Google
+# News diulang dengan backoff alih-alih langsung menggugurkan kata kunci.
+# pygooglenews mengunduh setiap feed dua kali dan tanpa batas laju.
+
+from urllib.parse import quote_plus
+
+import feedparser
+import requests
+
+from article_resolver import buat_http_session
+from governor import get_governor
+
+BASE_URL = "https://news.google.com/rss"
+HTTP_TIMEOUT_FEED = (3.05, 15)
+
+
+class GoogleNewsFeed:
+    def __init__(self, lang='id', country='ID', base_url=BASE_URL, session=None, governor=None):
+        self.lang = lang.lower()
+        self.country = country.upper()
+        self.base_url = base_url
+        self.session = session or buat_http_session()
+        self.governor = governor or get_governor()
+
+    def url_pencarian(self, query, from_=None, to_=None):
+        # Format query sama dengan pygooglenews agar kunci cache dan hasilnya tetap sebanding.
+        if from_:
+            query += f" after:{from_}"
+        if to_:
+            query += f" before:{to_}"
+        return f"{self.base_url}/search?q={quote_plus(query)}&ceid={self.country}:{self.lang}&hl={self.lang}&gl={self.country}"
+
+    def search(self, query, from_=None, to_=None):
+        resp = self.governor.get(self.session, self.url_pencarian(query, from_, to_), timeout=HTTP_TIMEOUT_FEED)
+        resp.raise_for_status()
+        if "news.google.com/rss/unsupported" in resp.url:
+            raise requests.HTTPError("Feed tidak tersedia", response=resp)
+        d = feedparser.parse(resp.content)
+        return {'feed': d.get('feed', {}), 'entries': d.get('entries', [])}
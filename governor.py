@@ -0,0 +1,319 @@
+# --- PENGATUR PERMINTAAN KELUAR ---
+# Semua permintaan HTTP ke Google News dan situs berita lewat satu pengatur per
+# proses. Tiap host punya token bucket yang lajunya menyesuaikan diri (AIMD):
+# naik sedikit demi sedikit selama sukses, turun setengah saat 429/5xx. Bucket dan
+# jeda `Retry-After` disimpan di SQLite sehingga app, worker job, dan monitor.py
+# berbagi satu batas laju per host (lihat LajuBersama). Permintaan
+# yang gagal diulang dengan backoff eksponensial ber-jitter dan menghormati
+# `Retry-After`. Host yang terus gagal diistirahatkan oleh circuit breaker.
+
+import random
+import sqlite3
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+import requests
+
+from storage import buka_db
+
+LAJU_AWAL = 10.0  # permintaan/detik per host
+LAJU_MIN = 0.2
+LAJU_MAKS = 50.0
+TAMBAH_LAJU = 0.5  # kenaikan per permintaan sukses
+FAKTOR_TURUN = 0.5
+JEDA_TURUN = 1.0  # laju turun paling sering sekali per detik per host
+MASA_LAJU_BERSAMA = 10 * 60  # host yang menganggur selama ini mulai lagi dari LAJU_AWAL
+MAKS_PERCOBAAN = 4
+DASAR_BACKOFF = 0.5
+MAKS_BACKOFF = 30.0
+MAKS_RETRY_AFTER = 120.0
+AMBANG_SIRKUIT = 5  # kegagalan beruntun sebelum host diistirahatkan
+JEDA_SIRKUIT = 30.0
+MAKS_JEDA_SIRKUIT = 300.0
+STATUS_DIULANG = {429, 500, 502, 503, 504}
+
+SIRKUIT_TERTUTUP = "tertutup"
+SIRKUIT_TERBUKA = "terbuka"
+SIRKUIT_SETENGAH = "setengah terbuka"
+
+PENGHITUNG = ("permintaan", "berhasil", "throttle", "error_server", "error_koneksi", "retry", "sirkuit_dibuka")
+
+
+class SirkuitTerbuka(Exception):
+    def __init__(self, host, sisa):
+        super().__init__(f"Host {host} sedang diistirahatkan ({sisa:.0f} d lagi)")
+        self.host = host
+        self.sisa = sisa
+
+
+def host_dari(url):
+    return urlparse(url).netloc.lower()
+
+
+def baca_retry_after(nilai):
+    # `Retry-After` berupa detik atau tanggal HTTP; None bila tidak ada/tidak valid.
+    if not nilai:
+        return None
+    try:
+        detik = float(nilai)
+    except ValueError:
+        try:
+            detik = parsedate_to_datetime(nilai).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(max(detik, 0.0), MAKS_RETRY_AFTER)
+
+
+def backoff(percobaan, retry_after=None):
+    # Full jitter; `Retry-After` dari server menjadi batas bawah.
+    jeda = random.uniform(0, min(MAKS_BACKOFF, DASAR_BACKOFF * 2 ** percobaan))
+    return max(jeda, retry_after or 0.0)
+
+
+class _Host:
+    def __init__(self, laju):
+        self.lock = threading.Lock()
+        self.laju = laju
+        self.token = 1.0
+        self.terakhir_isi = time.monotonic()
+        self.tunda_sampai = 0.0
+        self.terakhir_turun = 0.0
+        self.gagal_beruntun = 0
+        self.sirkuit = SIRKUIT_TERTUTUP
+        self.buka_sampai = 0.0
+        self.jeda_sirkuit = JEDA_SIRKUIT
+        self.probe_berjalan = False
+        self.hitung = dict.fromkeys(PENGHITUNG, 0)
+
+
+class LajuBersama:
+    # Token bucket per host yang dipakai bersama semua proses. Tiap pemesanan token adalah satu
+    # transaksi BEGIN IMMEDIATE, jadi proses lain menunggu giliran (waktu dinding, bukan monotonic).
+    def __init__(self, nama_db="pengatur_permintaan.sqlite"):
+        self._conn = buka_db(nama_db)
+        self._lock = threading.Lock()
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS laju_host ("
+                " host TEXT PRIMARY KEY, laju REAL, token REAL, terakhir_isi REAL, tunda_sampai REAL, terakhir_turun REAL)"
+            )
+
+    def _ubah(self, host, laju_awal, fungsi):
+        # Membaca-mengubah-menulis baris host secara atomik; `fungsi(nilai, sekarang)` mengubah `nilai` di tempat.
+        sekarang = time.time()
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            row = self._conn.execute(
+                "SELECT laju, token, terakhir_isi, tunda_sampai, terakhir_turun FROM laju_host WHERE host = ?", (host,),
+            ).fetchone()
+            nilai = dict(zip(("laju", "token", "terakhir_isi", "tunda_sampai", "terakhir_turun"), row or ()))
+            if not row or sekarang - nilai["terakhir_isi"] > MASA_LAJU_BERSAMA:
+                nilai = {"laju": laju_awal, "token": 1.0, "terakhir_isi": sekarang, "tunda_sampai": 0.0, "terakhir_turun": 0.0}
+            hasil = fungsi(nilai, sekarang)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO laju_host VALUES (?, ?, ?, ?, ?, ?)",
+                (host, nilai["laju"], nilai["token"], nilai["terakhir_isi"], nilai["tunda_sampai"], nilai["terakhir_turun"]),
+            )
+        return hasil
+
+    def pesan(self, host, laju_awal):
+        # Memesan satu token; mengembalikan (lama menunggu, laju).
+        def isi(n, sekarang):
+            n["token"] = min(max(1.0, n["laju"]), n["token"] + max(0.0, sekarang - n["terakhir_isi"]) * n["laju"]) - 1
+            n["terakhir_isi"] = sekarang
+            return max(-n["token"] / n["laju"] if n["token"] < 0 else 0.0, n["tunda_sampai"] - sekarang), n["laju"]
+        return self._ubah(host, laju_awal, isi)
+
+    def naik(self, host, laju_awal):
+        def isi(n, sekarang):
+            n["laju"] = min(LAJU_MAKS, n["laju"] + TAMBAH_LAJU)
+            return n["laju"]
+        return self._ubah(host, laju_awal, isi)
+
+    def turun(self, host, laju_awal, retry_after=None):
+        def isi(n, sekarang):
+            if sekarang - n["terakhir_turun"] >= JEDA_TURUN:
+                n["laju"], n["terakhir_turun"] = max(LAJU_MIN, n["laju"] * FAKTOR_TURUN), sekarang
+            if retry_after:
+                n["tunda_sampai"] = max(n["tunda_sampai"], sekarang + retry_after)
+            return n["laju"]
+        return self._ubah(host, laju_awal, isi)
+
+
+class OutboundGovernor:
+    def __init__(self, laju_awal=LAJU_AWAL, maks_percobaan=MAKS_PERCOBAAN, bersama=None):
+        self.laju_awal = laju_awal
+        self.maks_percobaan = maks_percobaan
+        self._bersama = bersama
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _host(self, host):
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = _Host(self.laju_awal)
+            return self._hosts[host]
+
+    def _izin(self, host, h):
+        # Memesan satu token; mengembalikan lama menunggu. Melempar SirkuitTerbuka bila host diistirahatkan.
+        with h.lock:
+            sekarang = time.monotonic()
+            if h.sirkuit == SIRKUIT_TERBUKA:
+                if sekarang < h.buka_sampai:
+                    raise SirkuitTerbuka(host, h.buka_sampai - sekarang)
+                h.sirkuit = SIRKUIT_SETENGAH
+            if h.sirkuit == SIRKUIT_SETENGAH:
+                # Hanya satu permintaan percobaan sampai host terbukti pulih.
+                if h.probe_berjalan:
+                    raise SirkuitTerbuka(host, 0)
+                h.probe_berjalan = True
+            h.hitung["permintaan"] += 1
+            if self._bersama is not None:
+                try:
+                    tunggu, h.laju = self._bersama.pesan(host, self.laju_awal)
+                    return max(tunggu, h.tunda_sampai - sekarang)
+                except sqlite3.Error:
+                    pass  # DB laju bersama bermasalah: pakai bucket proses ini saja.
+            h.token = min(max(1.0, h.laju), h.token + (sekarang - h.terakhir_isi) * h.laju)
+            h.terakhir_isi = sekarang
+            h.token -= 1
+            return max(-h.token / h.laju if h.token < 0 else 0.0, h.tunda_sampai - sekarang)
+
+    def _laju_bersama(self, h, nama, *args):
+        # Dipanggil di bawah h.lock; laju bersama menggantikan laju lokal bila DB dapat dipakai.
+        if self._bersama is None:
+            return
+        try:
+            h.laju = getattr(self._bersama, nama)(*args)
+        except sqlite3.Error:
+            pass
+
+    def _sukses(self, host, h):
+        with h.lock:
+            h.hitung["berhasil"] += 1
+            h.laju = min(LAJU_MAKS, h.laju + TAMBAH_LAJU)
+            self._laju_bersama(h, "naik", host, self.laju_awal)
+            h.gagal_beruntun = 0
+            h.probe_berjalan = False
+            if h.sirkuit != SIRKUIT_TERTUTUP:
+                h.sirkuit, h.jeda_sirkuit = SIRKUIT_TERTUTUP, JEDA_SIRKUIT
+
+    def _gagal(self, host, h, jenis, retry_after=None):
+        with h.lock:
+            sekarang = time.monotonic()
+            h.hitung[jenis] += 1
+            if jenis != "error_koneksi" and sekarang - h.terakhir_turun >= JEDA_TURUN:
+                h.laju = max(LAJU_MIN, h.laju * FAKTOR_TURUN)
+                h.terakhir_turun = sekarang
+            if retry_after:
+                # Berlaku untuk semua thread yang memakai host ini, bukan hanya permintaan ini.
+                h.tunda_sampai = max(h.tunda_sampai, sekarang + retry_after)
+            if jenis != "error_koneksi":
+                self._laju_bersama(h, "turun", host, self.laju_awal, retry_after)
+            h.gagal_beruntun += 1
+            if h.sirkuit == SIRKUIT_SETENGAH or h.gagal_beruntun >= AMBANG_SIRKUIT:
+                if h.sirkuit == SIRKUIT_SETENGAH:
+                    h.jeda_sirkuit = min(MAKS_JEDA_SIRKUIT, h.jeda_sirkuit * 2)
+                h.sirkuit = SIRKUIT_TERBUKA
+                h.buka_sampai = sekarang + max(h.jeda_sirkuit, retry_after or 0.0)
+                h.probe_berjalan = False
+                h.hitung["sirkuit_dibuka"] += 1
+
+    def request(self, session, method, url, maks_percobaan=None, **kwargs):
+        # Seperti `session.request`; respons 429/5xx dan error koneksi diulang. Setelah percobaan
+        # habis, respons terakhir dikembalikan (atau error terakhir dilempar).
+        host = host_dari(url)
+        h = self._host(host)
+        maks_percobaan = maks_percobaan or self.maks_percobaan
+        for percobaan in range(maks_percobaan):
+            tunggu = self._izin(host, h)
+            if tunggu > 0:
+                time.sleep(tunggu)
+            try:
+                resp = session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                self._gagal(host, h, "error_koneksi")
+                if percobaan == maks_percobaan - 1:
+                    raise
+                self._catat_retry(h)
+                time.sleep(backoff(percobaan))
+                continue
+            except Exception:
+                # Error lain (URL tidak valid, redirect berlebihan) bukan tanda host bermasalah.
+                with h.lock:
+                    h.probe_berjalan = False
+                raise
+            if resp.status_code not in STATUS_DIULANG:
+                self._sukses(host, h)
+                return resp
+            retry_after = baca_retry_after(resp.headers.get("Retry-After"))
+            self._gagal(host, h, "throttle" if resp.status_code == 429 else "error_server", retry_after)
+            if percobaan == maks_percobaan - 1:
+                return resp
+            resp.close()
+            self._catat_retry(h)
+            time.sleep(backoff(percobaan, retry_after))
+        return resp
+
+    def get(self, session, url, **kwargs):
+        return self.request(session, "GET", url, **kwargs)
+
+    def post(self, session, url, **kwargs):
+        return self.request(session, "POST", url, **kwargs)
+
+    @staticmethod
+    def _catat_retry(h):
+        with h.lock:
+            h.hitung["retry"] += 1
+
+    def sisa_jeda(self, url):
+        # Detik sampai host boleh dicoba lagi (0 bila sirkuit tidak terbuka).
+        h = self._host(host_dari(url))
+        with h.lock:
+            return max(0.0, h.buka_sampai - time.monotonic()) if h.sirkuit == SIRKUIT_TERBUKA else 0.0
+
+    def snapshot(self):
+        with self._lock:
+            hosts = list(self._hosts.items())
+        return {host: dict(h.hitung) for host, h in hosts}
+
+    def statistik(self, sejak=None):
+        # {host: {laju, sirkuit, permintaan, ...}}; penghitung dikurangi `sejak` (hasil snapshot) bila diberikan.
+        sejak = sejak or {}
+        hasil = {}
+        with self._lock:
+            hosts = list(self._hosts.items())
+        for host, h in hosts:
+            with h.lock:
+                awal = sejak.get(host, {})
+                hitung = {k: v - awal.get(k, 0) for k, v in h.hitung.items()}
+                if not hitung["permintaan"]:
+                    continue
+                hasil[host] = {"laju": round(h.laju, 2), "sirkuit": h.sirkuit, **hitung}
+        return hasil
+
+
+_governor = None
+_governor_lock = threading.Lock()
+
+
+def get_governor():
+    # Satu pengatur per proses, dipakai bersama pencarian dan pemuatan artikel; batas lajunya
+    # dibagi dengan proses lain lewat LajuBersama.
+    global _governor
+    with _governor_lock:
+        if _governor is None:
+            _governor = OutboundGovernor(bersama=LajuBersama())
+        return _governor
+
+
+def ringkas_statistik(statistik):
+    # Total seluruh host, untuk baris status.
+    total = dict.fromkeys(PENGHITUNG, 0)
+    for nilai in (statistik or {}).values():
+        for k in PENGHITUNG:
+            total[k] += nilai.get(k, 0)
+    total["host_terbuka"] = [host for host, nilai in (statistik or {}).items() if nilai.get("sirkuit") == SIRKUIT_TERBUKA]
+    return total
@@ -0,0 +1,445 @@
+# --- ANTREAN JOB SCRAPING ---
+# Scraping dijalankan sebagai job di proses worker terpisah dengan antrean
+# berbasis SQLite. Halaman Streamlit hanya mengirim job lalu memantau kemajuan
+# dan hasil parsialnya, sehingga navigasi atau refresh browser tidak memutus
+# proses. Job dipilih secara adil: pemilik dengan job berjalan paling sedikit
+# didahulukan.
+#
+# Worker dapat juga dijalankan manual:  python jobs.py
+
+import json
+import os
+import pickle
+import re
+import subprocess
+import sys
+import threading
+import time
+import traceback
+import uuid
+from datetime import datetime
+
+from storage import buka_db
+
+STATUS_ANTRI = "antri"
+STATUS_BERJALAN = "berjalan"
+STATUS_SELESAI = "selesai"
+STATUS_DIHENTIKAN = "dihentikan"
+STATUS_GAGAL = "gagal"
+STATUS_TERPUTUS = "terputus"
+STATUS_SEBAGIAN = "sebagian"  # run selesai, tetapi ada kata kunci yang gagal dicari
+STATUS_AKTIF = (STATUS_ANTRI, STATUS_BERJALAN)
+STATUS_DAPAT_DILANJUTKAN = (STATUS_DIHENTIKAN, STATUS_GAGAL, STATUS_TERPUTUS, STATUS_SEBAGIAN)
+
+JUMLAH_WORKER = 2
+INTERVAL_POLL = 1.0
+INTERVAL_HEARTBEAT = 5.0
+BATAS_HEARTBEAT = 30.0
+MAKS_PERINGATAN = 50
+SINYAL_DAUR_ULANG_BROWSER = "daur_ulang_browser"
+# Kolom hasil yang disimpan terpisah (terindeks) di samping JSON baris, untuk filter/urutan di sisi server.
+KOLOM_URUT = {"Nomor": "nomor", "Tanggal": "tanggal", "Kategori": "kategori", "Sumber": "sumber"}
+KOLOM_FILTER = ("kategori", "sumber")
+
+
+def tanggal_iso(teks):
+    try:
+        return datetime.strptime(teks, '%d-%m-%Y').date().isoformat()
+    except (ValueError, TypeError):
+        return None
+
+
+def kolom_terindeks(row):
+    return row.get("Kategori"), row.get("Sumber"), tanggal_iso(row.get("Tanggal"))
+
+
+def atribut_hasil(progress):
+    # Metadata run (waktu, statistik, permintaan) dari progress job.
+    attrs = {k: progress[k] for k in ("waktu_scraping", "waktu_render", "statistik", "permintaan", "kata_kunci_gagal") if k in progress}
+    # Job gagal/terputus tidak sempat menulis statistik akhir; pakai laporan status terakhir.
+    for kunci in ("statistik", "permintaan"):
+        if kunci not in attrs and (progress.get("status") or {}).get(kunci):
+            attrs[kunci] = progress["status"][kunci]
+    return attrs
+
+
+class JobQueue:
+    def __init__(self, nama_db="jobs.sqlite"):
+        self._conn = buka_db(nama_db)
+        self._lock = threading.Lock()
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " id TEXT PRIMARY KEY, owner TEXT, judul TEXT, status TEXT, params BLOB,"
+                " dibuat REAL, mulai REAL, selesai REAL, worker TEXT, berhenti INTEGER DEFAULT 0,"
+                " progress TEXT, error TEXT)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, dibuat)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS job_rows (job_id TEXT, nomor INTEGER, data TEXT,"
+                " kategori TEXT, sumber TEXT, tanggal TEXT, PRIMARY KEY (job_id, nomor))"
+            )
+            self._migrasi_job_rows()
+            for kolom in ("kategori", "sumber", "tanggal"):
+                self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_job_rows_{kolom} ON job_rows (job_id, {kolom})")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS workers (id TEXT PRIMARY KEY, pid INTEGER, heartbeat REAL)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS sinyal_worker (nama TEXT PRIMARY KEY, waktu REAL)")
+            # Checkpoint: kata kunci (urutan task) yang sudah tuntas + jumlah baris yang sah saat itu.
+            self._conn.execute("CREATE TABLE IF NOT EXISTS job_tasks_selesai (job_id TEXT, urutan INTEGER, PRIMARY KEY (job_id, urutan))")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS job_checkpoint (job_id TEXT PRIMARY KEY, jumlah_baris INTEGER, waktu REAL)")
+
+    def _migrasi_job_rows(self):
+        # Basis data lama hanya menyimpan JSON; kolom terindeks ditambahkan dan diisi dari JSON tersebut.
+        kolom = {r[1] for r in self._conn.execute("PRAGMA table_info(job_rows)")}
+        if "tanggal" in kolom:
+            return
+        for nama in ("kategori", "sumber", "tanggal"):
+            self._conn.execute(f"ALTER TABLE job_rows ADD COLUMN {nama} TEXT")
+        rows = self._conn.execute("SELECT rowid, data FROM job_rows").fetchall()
+        self._conn.executemany(
+            "UPDATE job_rows SET kategori = ?, sumber = ?, tanggal = ? WHERE rowid = ?",
+            [(*kolom_terindeks(json.loads(data)), rowid) for rowid, data in rows],
+        )
+
+    # --- Sisi aplikasi ---
+    def submit(self, owner, judul, params):
+        job_id = uuid.uuid4().hex[:12]
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO jobs (id, owner, judul, status, params, dibuat, progress) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, owner, judul, STATUS_ANTRI, pickle.dumps(params), time.time(), json.dumps({})),
+            )
+        return job_id
+
+    def request_stop(self, job_id):
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE jobs SET berhenti = 1 WHERE id = ?", (job_id,))
+            # Job yang belum sempat diambil worker langsung dibatalkan.
+            self._conn.execute("UPDATE jobs SET status = ?, selesai = ? WHERE id = ? AND status = ?", (STATUS_DIHENTIKAN, time.time(), job_id, STATUS_ANTRI))
+
+    def resume(self, job_id):
+        # Masukkan kembali job yang berhenti/gagal/terputus ke antrean; worker melanjutkan dari checkpoint.
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                f"UPDATE jobs SET status = ?, berhenti = 0, selesai = NULL, error = NULL WHERE id = ? AND status IN ({','.join('?' * len(STATUS_DAPAT_DILANJUTKAN))})",
+                (STATUS_ANTRI, job_id, *STATUS_DAPAT_DILANJUTKAN),
+            )
+        return cur.rowcount > 0
+
+    def get(self, job_id):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, owner, judul, status, dibuat, mulai, selesai, progress, error,"
+                " (SELECT COUNT(*) FROM job_rows WHERE job_id = jobs.id) FROM jobs WHERE id = ?", (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        kunci = ["id", "owner", "judul", "status", "dibuat", "mulai", "selesai", "progress", "error", "jumlah_baris"]
+        job = dict(zip(kunci, row))
+        job["progress"] = json.loads(job["progress"] or "{}")
+        return job
+
+    def params(self, job_id):
+        with self._lock:
+            row = self._conn.execute("SELECT params FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return pickle.loads(row[0]) if row else None
+
+    def posisi_antrean(self, job_id):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = ? AND dibuat < (SELECT dibuat FROM jobs WHERE id = ?)",
+                (STATUS_ANTRI, job_id),
+            ).fetchone()
+        return row[0] + 1
+
+    def rows(self, job_id, setelah=0, limit=-1):
+        with self._lock:
+            data = self._conn.execute(
+                "SELECT data FROM job_rows WHERE job_id = ? AND nomor > ? ORDER BY nomor LIMIT ?", (job_id, setelah, limit),
+            ).fetchall()
+        return [json.loads(d[0]) for d in data]
+
+    def iter_rows(self, job_id, ukuran=5000):
+        # Baris hasil per potongan, untuk ekspor tanpa memuat seluruh hasil sekaligus.
+        setelah = 0
+        while True:
+            batch = self.rows(job_id, setelah=setelah, limit=ukuran)
+            if not batch:
+                return
+            yield batch
+            setelah = int(batch[-1]["Nomor"])
+
+    def rows_terakhir(self, job_id, limit):
+        with self._lock:
+            data = self._conn.execute(
+                "SELECT data FROM job_rows WHERE job_id = ? ORDER BY nomor DESC LIMIT ?", (job_id, limit),
+            ).fetchall()
+        return [json.loads(d[0]) for d in reversed(data)]
+
+    def halaman_rows(self, job_id, halaman=1, ukuran=50, urut="Nomor", turun=False, kategori=None, sumber=None, dari=None, sampai=None, cari=None):
+        # Filter, urutan, dan paging dikerjakan SQLite; hanya baris satu halaman yang dimuat.
+        # Mengembalikan (rows, total baris terfilter, halaman setelah dibatasi ke jumlah halaman).
+        where, args = ["job_id = ?"], [job_id]
+        for kolom, nilai in (("kategori", kategori), ("sumber", sumber)):
+            if nilai:
+                where.append(f"{kolom} IN ({','.join('?' * len(nilai))})")
+                args.extend(nilai)
+        if dari:
+            where.append("tanggal >= ?")
+            args.append(str(dari))
+        if sampai:
+            where.append("tanggal <= ?")
+            args.append(str(sampai))
+        if cari:
+            where.append("data LIKE ? ESCAPE '\\'")
+            args.append("%" + re.sub(r"([\\%_])", r"\\\1", cari) + "%")
+        where = " AND ".join(where)
+        arah = "DESC" if turun else "ASC"
+        kolom = KOLOM_URUT.get(urut, "nomor")
+        with self._lock:
+            total = self._conn.execute(f"SELECT COUNT(*) FROM job_rows WHERE {where}", args).fetchone()[0]
+            halaman = max(1, min(halaman, -(-total // ukuran)))
+            data = self._conn.execute(
+                f"SELECT data FROM job_rows WHERE {where} ORDER BY {kolom} IS NULL, {kolom} {arah}, nomor {arah} LIMIT ? OFFSET ?",
+                (*args, ukuran, (halaman - 1) * ukuran),
+            ).fetchall()
+        return [json.loads(d[0]) for d in data], total, halaman
+
+    def nilai_unik(self, job_id, kolom):
+        # Pilihan filter: [(nilai, jumlah baris)] untuk kolom "kategori" atau "sumber".
+        if kolom not in KOLOM_FILTER:
+            raise ValueError(f"Kolom filter tidak dikenal: {kolom}")
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT {kolom}, COUNT(*) FROM job_rows WHERE job_id = ? AND {kolom} IS NOT NULL GROUP BY {kolom} ORDER BY {kolom}", (job_id,),
+            ).fetchall()
+
+    def rentang_tanggal(self, job_id):
+        with self._lock:
+            return self._conn.execute("SELECT MIN(tanggal), MAX(tanggal) FROM job_rows WHERE job_id = ?", (job_id,)).fetchone()
+
+    def list_jobs(self, owner=None, limit=20):
+        sql = "SELECT id FROM jobs"
+        args = []
+        if owner:
+            sql += " WHERE owner = ?"
+            args.append(owner)
+        sql += " ORDER BY dibuat DESC LIMIT ?"
+        args.append(limit)
+        with self._lock:
+            ids = [r[0] for r in self._conn.execute(sql, args).fetchall()]
+        return [self.get(i) for i in ids]
+
+    # --- Sisi worker ---
+    def claim(self, worker_id, job_ids=None):
+        # `job_ids` (opsional): hanya ambil dari job-job ini.
+        filter_id, args = "", []
+        if job_ids is not None:
+            job_ids = list(job_ids)
+            filter_id, args = f" AND j.id IN ({','.join('?' * len(job_ids))})", job_ids
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            row = self._conn.execute(
+                f"SELECT j.id FROM jobs j WHERE j.status = ?{filter_id}"
+                " ORDER BY (SELECT COUNT(*) FROM jobs r WHERE r.owner = j.owner AND r.status = ?) ASC, j.dibuat ASC LIMIT 1",
+                (STATUS_ANTRI, *args, STATUS_BERJALAN),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, worker = ?, mulai = ? WHERE id = ?", (STATUS_BERJALAN, worker_id, time.time(), row[0]),
+            )
+        return row[0]
+
+    def stop_requested(self, job_id):
+        with self._lock:
+            row = self._conn.execute("SELECT berhenti FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return bool(row and row[0])
+
+    def update_progress(self, job_id, progress):
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE jobs SET progress = ? WHERE id = ?", (json.dumps(progress, default=str), job_id))
+
+    def append_rows(self, job_id, rows):
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO job_rows VALUES (?, ?, ?, ?, ?, ?)",
+                [(job_id, int(r["Nomor"]), json.dumps(r, default=str, ensure_ascii=False), *kolom_terindeks(r)) for r in rows],
+            )
+
+    def simpan_checkpoint(self, job_id, urutan, jumlah_baris):
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR IGNORE INTO job_tasks_selesai VALUES (?, ?)", (job_id, urutan))
+            self._conn.execute("INSERT OR REPLACE INTO job_checkpoint VALUES (?, ?, ?)", (job_id, jumlah_baris, time.time()))
+
+    def checkpoint(self, job_id):
+        # Mengembalikan {'selesai': set urutan, 'rows': [...]} atau None bila job belum punya checkpoint.
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT jumlah_baris FROM job_checkpoint WHERE job_id = ?", (job_id,)).fetchone()
+            if row is None:
+                self._conn.execute("DELETE FROM job_rows WHERE job_id = ?", (job_id,))
+                return None
+            # Baris yang terkirim setelah checkpoint terakhir berasal dari kata kunci yang belum tuntas.
+            self._conn.execute("DELETE FROM job_rows WHERE job_id = ? AND nomor > ?", (job_id, row[0]))
+            selesai = {r[0] for r in self._conn.execute("SELECT urutan FROM job_tasks_selesai WHERE job_id = ?", (job_id,))}
+        return {'selesai': selesai, 'rows': self.rows(job_id)}
+
+    def finish(self, job_id, status, error=None):
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE jobs SET status = ?, selesai = ?, error = ? WHERE id = ?", (status, time.time(), error, job_id))
+
+    def heartbeat(self, worker_id):
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO workers VALUES (?, ?, ?)", (worker_id, os.getpid(), time.time()))
+
+    def kirim_sinyal(self, nama):
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO sinyal_worker VALUES (?, ?)", (nama, time.time()))
+
+    def waktu_sinyal(self, nama):
+        with self._lock:
+            row = self._conn.execute("SELECT waktu FROM sinyal_worker WHERE nama = ?", (nama,)).fetchone()
+        return row[0] if row else 0.0
+
+    def jumlah_worker_hidup(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM workers WHERE heartbeat > ?", (time.time() - BATAS_HEARTBEAT,)).fetchone()[0]
+
+    def tandai_terputus(self):
+        # Job "berjalan" yang workernya tidak lagi mengirim heartbeat dianggap terputus.
+        batas = time.time() - BATAS_HEARTBEAT
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, selesai = ? WHERE status = ?"
+                " AND worker NOT IN (SELECT id FROM workers WHERE heartbeat > ?)",
+                (STATUS_TERPUTUS, time.time(), STATUS_BERJALAN, batas),
+            )
+            self._conn.execute("DELETE FROM workers WHERE heartbeat <= ?", (batas,))
+
+
+class JobReporter:
+    # Reporter pipeline yang menulis kemajuan dan baris hasil ke antrean job.
+    def __init__(self, queue, job_id, kolom):
+        self.queue = queue
+        self.job_id = job_id
+        self.progress = {"kolom": kolom, "peringatan": []}
+        self._cek_berhenti = 0.0
+        self._berhenti = False
+        self._tulis_status = 0.0
+
+    def should_stop(self):
+        if not self._berhenti and time.time() - self._cek_berhenti >= INTERVAL_POLL:
+            self._cek_berhenti = time.time()
+            self._berhenti = self.queue.stop_requested(self.job_id)
+        return self._berhenti
+
+    def status(self, info):
+        self.progress["status"] = info
+        if time.time() - self._tulis_status >= INTERVAL_POLL:
+            self._tulis_status = time.time()
+            self.queue.update_progress(self.job_id, self.progress)
+
+    def warning(self, pesan):
+        if len(self.progress["peringatan"]) < MAKS_PERINGATAN:
+            self.progress["peringatan"].append(pesan)
+        self.queue.update_progress(self.job_id, self.progress)
+
+    def rows(self, baris_baru):
+        if baris_baru:
+            self.queue.append_rows(self.job_id, baris_baru)
+
+    def checkpoint(self, urutan_task, jumlah_baris):
+        self.queue.simpan_checkpoint(self.job_id, urutan_task, jumlah_baris)
+
+    def selesai(self, hasil_df):
+        self.progress.update({k: v for k, v in hasil_df.attrs.items()})
+        self.queue.update_progress(self.job_id, self.progress)
+
+
+def jalankan_job(queue, job_id):
+    from pipeline import kolom_hasil, run_scrape
+
+    params = queue.params(job_id)
+    reporter = JobReporter(queue, job_id, kolom_hasil(params['mode_ringkasan'], params.get('mode_riwayat', "Tandai")))
+    try:
+        hasil_df = run_scrape(
+            params['tanggal_awal'], params['tanggal_akhir'], params['df'], params['df_daerah'], params['mode_ringkasan'],
+            reporter=reporter, mode_riwayat=params.get('mode_riwayat', "Tandai"), periode=params.get('periode'),
+            bypass_cache=params.get('bypass_cache', False), checkpoint=queue.checkpoint(job_id),
+            mode_delta=params.get('mode_delta', False),
+        )
+        reporter.selesai(hasil_df)
+        gagal = hasil_df.attrs.get('kata_kunci_gagal')
+        if reporter.should_stop():
+            queue.finish(job_id, STATUS_DIHENTIKAN)
+        elif gagal:
+            # Kata kunci yang gagal tidak masuk checkpoint, sehingga dicari ulang saat job dilanjutkan.
+            queue.finish(job_id, STATUS_SEBAGIAN, error=f"{len(gagal)} kata kunci gagal dicari: {', '.join(gagal)}")
+        else:
+            queue.finish(job_id, STATUS_SELESAI)
+    except Exception as e:
+        reporter.warning(traceback.format_exc(limit=5))
+        queue.finish(job_id, STATUS_GAGAL, error=str(e))
+
+
+def worker_loop(worker_id=None, parent_pid=None, nama_db="jobs.sqlite", sampai_kosong=False, job_ids=None):
+    # `sampai_kosong`: kembali begitu antrean habis (dipakai run terjadwal, lihat monitor.py).
+    # `job_ids`: hanya proses job-job ini; job pengguna lain di antrean dibiarkan untuk worker aplikasi.
+    worker_id = worker_id or f"worker-{os.getpid()}"
+    queue = JobQueue(nama_db)
+    berhenti = threading.Event()
+
+    def _heartbeat():
+        while not berhenti.is_set():
+            queue.heartbeat(worker_id)
+            # Worker ikut berhenti bila proses aplikasi induknya sudah mati.
+            if parent_pid and os.getppid() != parent_pid:
+                os._exit(0)
+            berhenti.wait(INTERVAL_HEARTBEAT)
+
+    queue.heartbeat(worker_id)
+    queue.tandai_terputus()
+    sinyal_browser = queue.waktu_sinyal(SINYAL_DAUR_ULANG_BROWSER)
+    threading.Thread(target=_heartbeat, name="skena-heartbeat", daemon=True).start()
+    try:
+        while True:
+            # Reboot aplikasi meminta pool browser didaur ulang; dikerjakan di antara job agar
+            # driver yang sedang dipinjam job berjalan tidak ikut ditutup.
+            sinyal = queue.waktu_sinyal(SINYAL_DAUR_ULANG_BROWSER)
+            if sinyal > sinyal_browser:
+                sinyal_browser = sinyal
+                if "pipeline" in sys.modules:
+                    sys.modules["pipeline"].tutup_browser_pool()
+            job_id = queue.claim(worker_id, job_ids)
+            if job_id is None:
+                if sampai_kosong:
+                    return
+                time.sleep(INTERVAL_POLL)
+                continue
+            jalankan_job(queue, job_id)
+    finally:
+        berhenti.set()
+
+
+def ensure_workers(queue, jumlah=JUMLAH_WORKER):
+    # Menyalakan proses worker yang kurang (berdasarkan heartbeat), dipanggil dari aplikasi.
+    kurang = jumlah - queue.jumlah_worker_hidup()
+    proses = []
+    for _ in range(max(0, kurang)):
+        worker_id = f"worker-{uuid.uuid4().hex[:8]}"
+        proses.append(subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "--worker-id", worker_id, "--parent-pid", str(os.getpid())],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ))
+        queue.heartbeat(worker_id)  # Cegah peluncuran ganda sebelum worker sempat melapor.
+    return proses
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Worker job scraping SKENA")
+    parser.add_argument("--worker-id", default=None)
+    parser.add_argument("--parent-pid", type=int, default=None)
+    args = parser.parse_args()
+    worker_loop(worker_id=args.worker_id, parent_pid=args.parent_pid)
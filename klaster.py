@@ -0,0 +1,98 @@
+# --- KLASTER BERITA HAMPIR SAMA ---
+# Rilis yang sama sering dimuat ulang banyak media dengan judul yang sedikit
+# berbeda. Judul bersih diubah menjadi himpunan kata (tanpa kata umum dan nama
+# lokasi), diringkas dengan MinHash, lalu kandidat dicari lewat LSH (banding)
+# sehingga tiap judul baru hanya dibandingkan dengan segelintir judul lain.
+# Kandidat diverifikasi dengan Jaccard sebenarnya, rentang tanggal terbit, dan
+# kesamaan istilah pembeda (lokasi dan kata kunci) yang disebut di judul.
+
+import hashlib
+import re
+from collections import defaultdict
+
+JUMLAH_BAND = 20
+BARIS_PER_BAND = 3
+AMBANG_KEMIRIPAN = 0.7  # Jaccard minimum antar himpunan kata judul
+JENDELA_HARI = 3  # salinan rilis biasanya terbit dalam beberapa hari
+_PRIMA = (1 << 61) - 1
+_KOEFISIEN = [
+    (int.from_bytes(hashlib.blake2b(f"a{i}".encode(), digest_size=8).digest(), "big") % _PRIMA | 1,
+     int.from_bytes(hashlib.blake2b(f"b{i}".encode(), digest_size=8).digest(), "big") % _PRIMA)
+    for i in range(JUMLAH_BAND * BARIS_PER_BAND)
+]
+KATA_UMUM = {
+    "di", "ke", "dari", "dan", "yang", "untuk", "dengan", "pada", "dalam", "ini", "itu", "akan", "jadi", "oleh",
+    "atau", "juga", "tak", "tidak", "hingga", "sampai", "sebagai", "bagi", "soal", "terkait", "usai", "jelang",
+    "the", "of", "in", "video", "foto", "berita", "kabupaten", "kab", "kecamatan", "kec", "desa", "kota",
+}
+POLA_KATA = re.compile(r"\w+")
+
+
+def _hash_kata(kata):
+    return int.from_bytes(hashlib.blake2b(kata.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def minhash(himpunan):
+    nilai = [_hash_kata(k) for k in himpunan]
+    return [min((a * x + b) % _PRIMA for x in nilai) for a, b in _KOEFISIEN]
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+
+class KlasterBerita:
+    # `abaikan`: nama lokasi yang tidak ikut dihitung (kesamaan lokasi dicek terpisah lewat `pembeda`).
+    def __init__(self, abaikan=(), ambang=AMBANG_KEMIRIPAN, jendela_hari=JENDELA_HARI):
+        self.abaikan = set(KATA_UMUM)
+        for nama in abaikan:
+            self.abaikan.update(POLA_KATA.findall(str(nama).lower()))
+        self.ambang = ambang
+        self.jendela_hari = jendela_hari
+        self._judul = []  # (kata, tanggal, pembeda, id_klaster)
+        self._tepat = {}
+        self._band = [defaultdict(list) for _ in range(JUMLAH_BAND)]
+        self.jumlah = 0
+
+    def kata(self, judul):
+        return frozenset(k for k in POLA_KATA.findall(judul.lower()) if k not in self.abaikan and len(k) > 1)
+
+    def _cocok(self, indeks, tanggal, pembeda):
+        _, tanggal_lain, pembeda_lain, _ = self._judul[indeks]
+        if pembeda != pembeda_lain:
+            return False
+        return tanggal is None or tanggal_lain is None or abs((tanggal - tanggal_lain).days) <= self.jendela_hari
+
+    def tempatkan(self, judul, tanggal=None, pembeda=frozenset()):
+        # Mengembalikan id klaster judul ini; klaster baru dibuat bila tidak ada yang cukup mirip.
+        # `pembeda`: istilah yang harus sama persis antar anggota (mis. kecamatan, kata kunci di judul).
+        kata = self.kata(judul)
+        if not kata:
+            self.jumlah += 1
+            return self.jumlah
+        pembeda = frozenset(pembeda)
+        id_klaster = None
+        for indeks in self._tepat.get(kata, ()):
+            if self._cocok(indeks, tanggal, pembeda):
+                id_klaster = self._judul[indeks][3]
+                break
+        tanda = minhash(kata)
+        kunci_band = [tuple(tanda[b * BARIS_PER_BAND:(b + 1) * BARIS_PER_BAND]) for b in range(JUMLAH_BAND)]
+        if id_klaster is None:
+            kandidat = set()
+            for band, kunci in zip(self._band, kunci_band):
+                kandidat.update(band.get(kunci, ()))
+            terbaik = self.ambang - 1e-9
+            for indeks in sorted(kandidat):
+                skor = jaccard(kata, self._judul[indeks][0])
+                if skor > terbaik and self._cocok(indeks, tanggal, pembeda):
+                    terbaik, id_klaster = skor, self._judul[indeks][3]
+        if id_klaster is None:
+            self.jumlah += 1
+            id_klaster = self.jumlah
+        indeks = len(self._judul)
+        self._judul.append((kata, tanggal, pembeda, id_klaster))
+        self._tepat.setdefault(kata, []).append(indeks)
+        for band, kunci in zip(self._band, kunci_band):
+            band[kunci].append(indeks)
+        return id_klaster
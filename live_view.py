@@ -0,0 +1,74 @@
+# --- BUFFER HASIL LIVE ---
+# Baris baru ditampung di buffer kolom (list per kolom), bukan pd.concat per
+# baris. Baris baru hanya dikirim ke tampilan (callback `on_flush`) paling sering
+# setiap `interval_ms` atau setiap `setiap_baris` baris baru, mana yang lebih dulu.
+# DataFrame akhir dibangun sekali saja dari buffer. Baris yang sudah terkirim lalu
+# diubah (mis. ukuran klaster bertambah) dikirim ulang pada flush berikutnya.
+
+import time
+
+import pandas as pd
+
+INTERVAL_RENDER_MS = 1000
+RENDER_SETIAP_BARIS = 25
+
+
+class RowBuffer:
+    def __init__(self, kolom, on_flush=None, interval_ms=INTERVAL_RENDER_MS, setiap_baris=RENDER_SETIAP_BARIS):
+        self.kolom = list(kolom)
+        self.on_flush = on_flush
+        self.interval_ms = interval_ms
+        self.setiap_baris = setiap_baris
+        self.buffer = {k: [] for k in self.kolom}
+        self.waktu_flush = 0.0
+        self.jumlah_flush = 0
+        self._terakhir_flush = 0.0
+        self._sudah_dikirim = 0
+        self._diubah = set()
+
+    def __len__(self):
+        return len(self.buffer[self.kolom[0]]) if self.kolom else 0
+
+    def append(self, row):
+        for k in self.kolom:
+            self.buffer[k].append(row.get(k, ""))
+        self.maybe_flush()
+
+    def muat(self, rows):
+        # Baris dari checkpoint sebelumnya: masuk buffer tanpa dikirim ulang.
+        for row in rows:
+            for k in self.kolom:
+                self.buffer[k].append(row.get(k, ""))
+        self._sudah_dikirim = len(self)
+
+    def ubah(self, indeks, kolom, nilai):
+        self.buffer[kolom][indeks] = nilai
+        if indeks < self._sudah_dikirim:
+            self._diubah.add(indeks)
+
+    def baris(self, mulai=0, akhir=None):
+        akhir = len(self) if akhir is None else akhir
+        return [{k: self.buffer[k][i] for k in self.kolom} for i in range(mulai, akhir)]
+
+    def maybe_flush(self, paksa=False):
+        tertunda = len(self) - self._sudah_dikirim + len(self._diubah)
+        if not tertunda and not paksa:
+            return
+        lewat_ms = (time.time() - self._terakhir_flush) * 1000
+        if paksa or tertunda >= self.setiap_baris or lewat_ms >= self.interval_ms:
+            self.flush()
+
+    def flush(self):
+        t0 = time.time()
+        akhir = len(self)
+        if self.on_flush is not None:
+            diubah = [{k: self.buffer[k][i] for k in self.kolom} for i in sorted(self._diubah)]
+            self.on_flush(diubah + self.baris(self._sudah_dikirim, akhir))
+        self._sudah_dikirim = akhir
+        self._diubah.clear()
+        self._terakhir_flush = time.time()
+        self.jumlah_flush += 1
+        self.waktu_flush += self._terakhir_flush - t0
+
+    def to_dataframe(self):
+        return pd.DataFrame(self.buffer, columns=self.kolom)
@@ -0,0 +1,86 @@
+# --- PENCOCOK MULTI-POLA ---
+# Semua nama lokasi (kabupaten + kecamatan/desa) dan kata kunci aktif dikompilasi
+# sekali per run menjadi satu regex berbasis trie dengan batas kata. Satu kali
+# pemindaian teks mengembalikan seluruh lokasi dan kata kunci yang cocok. Kata kunci
+# yang bersarang di dalam pola lain ikut dilaporkan ("beras" dalam "harga beras");
+# lokasi hanya yang terpanjang ("Andoolo Barat" tanpa "Andoolo").
+
+import re
+from collections import namedtuple
+
+MatchResult = namedtuple("MatchResult", ["lokasi", "keywords"])
+AKHIR_KATA = re.compile(r"\w(?!\w)")
+
+
+def _trie_regex(words):
+    # Trie karakter -> regex dengan prefix bersama, sehingga biaya per posisi tidak
+    # tumbuh linear dengan jumlah pola.
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def _pola(node):
+        if "" in node and len(node) == 1:
+            return None
+        cabang, opsional = [], "" in node
+        for ch in sorted(k for k in node if k):
+            sub = _pola(node[ch])
+            cabang.append((r"\s+" if ch == " " else re.escape(ch)) + (sub or ""))
+        hasil = cabang[0] if len(cabang) == 1 else "(?:" + "|".join(cabang) + ")"
+        if opsional:
+            hasil = "(?:" + hasil + ")?"
+        return hasil
+
+    return _pola(trie) if trie else None
+
+
+class MultiPatternMatcher:
+    def __init__(self, lokasi, keywords=()):
+        self._jenis = {}
+        self._asli = {}
+        for nama in lokasi:
+            self._tambah(nama, "lokasi")
+        for keyword in keywords:
+            self._tambah(keyword, "keyword")
+        pola = _trie_regex(sorted(self._jenis))
+        # Lookahead: dicoba di setiap awal kata tanpa mengonsumsi teks, sehingga kecocokan boleh
+        # tumpang tindih. Grup menangkap pola terpanjang; pola yang lebih pendek di awal yang sama
+        # dicek lewat prefiksnya di `cari`.
+        self._regex = re.compile(r"(?<!\w)(?=(" + pola + r")(?!\w))", re.IGNORECASE) if pola else None
+
+    def _tambah(self, teks, jenis):
+        kunci = " ".join(str(teks).lower().split())
+        if not kunci:
+            return
+        self._jenis.setdefault(kunci, set()).add(jenis)
+        self._asli.setdefault(kunci, str(teks).strip())
+
+    def __len__(self):
+        return len(self._jenis)
+
+    def cari(self, *teks):
+        lokasi, keywords = set(), set()
+        if self._regex is None:
+            return MatchResult(lokasi, keywords)
+        for bagian in teks:
+            if not bagian:
+                continue
+            batas_lokasi = 0
+            for m in self._regex.finditer(bagian):
+                cocok = m.group(1)
+                # Kecocokan penuh ikut dicek: pola boleh berakhir dengan tanda baca, mis. "(BUMDes)".
+                akhir_kata = {a.end() for a in AKHIR_KATA.finditer(cocok)} | {len(cocok)}
+                for akhir in sorted(akhir_kata, reverse=True):
+                    kunci = " ".join(cocok[:akhir].lower().split())
+                    jenis = self._jenis.get(kunci, ())
+                    if "lokasi" in jenis and m.start() >= batas_lokasi:
+                        lokasi.add(kunci)
+                        batas_lokasi = m.start() + akhir
+                    if "keyword" in jenis: keywords.add(kunci)
+        return MatchResult(lokasi, keywords)
+
+    def nama_asli(self, kunci):
+        return self._asli.get(kunci, kunci)
@@ -0,0 +1,120 @@
+# --- PEMANTAUAN TERJADWAL (MODE DELTA) ---
+# Set kata kunci yang disimpan dari aplikasi dapat dijalankan ulang tanpa UI,
+# misalnya mingguan lewat cron, dalam mode delta: hanya berita baru sejak run
+# sebelumnya yang dicari dan dimuat. Hasilnya masuk antrean job biasa sehingga
+# dapat dibuka dari Daftar Job di aplikasi.
+#
+#   python monitor.py              # jadwalkan semua set aktif lalu proses hingga selesai
+#   python monitor.py --daftar     # tampilkan set tersimpan
+#   python monitor.py --set 3      # hanya set tertentu
+#
+# Contoh cron (Senin 06.00):  0 6 * * 1  cd /path/skena && python monitor.py
+
+import pickle
+import threading
+import time
+from datetime import date
+
+from jobs import JobQueue, worker_loop
+from storage import buka_db
+
+PEMILIK_TERJADWAL = "terjadwal"
+
+
+def triwulan_berjalan(hari_ini=None):
+    # (tahun, "Triwulan N", tanggal_awal, tanggal_akhir) untuk triwulan yang memuat `hari_ini`.
+    hari_ini = hari_ini or date.today()
+    n = (hari_ini.month - 1) // 3 + 1
+    akhir_bulan = {1: "03-31", 2: "06-30", 3: "09-30", 4: "12-31"}[n]
+    return hari_ini.year, f"Triwulan {n}", f"{hari_ini.year}-{3 * n - 2:02d}-01", f"{hari_ini.year}-{akhir_bulan}"
+
+
+class MonitorSets:
+    def __init__(self, nama_db="jobs.sqlite"):
+        self._conn = buka_db(nama_db)
+        self._lock = threading.Lock()
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS set_pantau ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT, nama TEXT, params BLOB, aktif INTEGER DEFAULT 1,"
+                " dibuat REAL, terakhir_jalan REAL, job_terakhir TEXT)"
+            )
+
+    def simpan(self, nama, params):
+        # `params`: df (kata kunci), df_daerah, mode_ringkasan, mode_riwayat, sub_page.
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                "INSERT INTO set_pantau (nama, params, dibuat) VALUES (?, ?, ?)", (nama, pickle.dumps(params), time.time()),
+            )
+        return cur.lastrowid
+
+    def daftar(self, hanya_aktif=False):
+        sql = "SELECT id, nama, aktif, dibuat, terakhir_jalan, job_terakhir FROM set_pantau"
+        if hanya_aktif:
+            sql += " WHERE aktif = 1"
+        with self._lock:
+            rows = self._conn.execute(sql + " ORDER BY id").fetchall()
+        kunci = ["id", "nama", "aktif", "dibuat", "terakhir_jalan", "job_terakhir"]
+        return [dict(zip(kunci, r)) for r in rows]
+
+    def params(self, set_id):
+        with self._lock:
+            row = self._conn.execute("SELECT params FROM set_pantau WHERE id = ?", (set_id,)).fetchone()
+        return pickle.loads(row[0]) if row else None
+
+    def set_aktif(self, set_id, aktif):
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE set_pantau SET aktif = ? WHERE id = ?", (int(bool(aktif)), set_id))
+
+    def hapus(self, set_id):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM set_pantau WHERE id = ?", (set_id,))
+
+    def tandai_jalan(self, set_id, job_id):
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE set_pantau SET terakhir_jalan = ?, job_terakhir = ? WHERE id = ?", (time.time(), job_id, set_id))
+
+
+def jadwalkan(queue, sets, set_ids=None, hari_ini=None):
+    # Mengirim satu job delta per set aktif untuk triwulan berjalan; mengembalikan daftar job_id.
+    tahun, triwulan, tanggal_awal, tanggal_akhir = triwulan_berjalan(hari_ini)
+    job_ids = []
+    for s in sets.daftar(hanya_aktif=set_ids is None):
+        if set_ids is not None and s["id"] not in set_ids:
+            continue
+        params = sets.params(s["id"])
+        payload = dict(
+            params, tahun=tahun, triwulan=triwulan, start_date=None, end_date=None,
+            tanggal_awal=tanggal_awal, tanggal_akhir=tanggal_akhir, periode=f"{triwulan}_{tahun}",
+            bypass_cache=True, mode_delta=True,
+        )
+        judul = f"🛰️ {s['nama']} · {triwulan}_{tahun} · delta"
+        job_id = queue.submit(PEMILIK_TERJADWAL, judul, payload)
+        sets.tandai_jalan(s["id"], job_id)
+        job_ids.append(job_id)
+    return job_ids
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Pemantauan terjadwal (mode delta) SKENA")
+    parser.add_argument("--daftar", action="store_true", help="Tampilkan set pemantauan tersimpan")
+    parser.add_argument("--set", type=int, action="append", dest="set_ids", help="Jalankan set tertentu (boleh berulang)")
+    parser.add_argument("--tanpa-proses", action="store_true", help="Hanya masukkan ke antrean; biarkan worker aplikasi yang memproses")
+    args = parser.parse_args()
+
+    sets = MonitorSets()
+    if args.daftar:
+        for s in sets.daftar():
+            terakhir = time.strftime('%d-%m-%Y %H:%M', time.localtime(s["terakhir_jalan"])) if s["terakhir_jalan"] else "-"
+            print(f"[{s['id']}] {s['nama']} | aktif={bool(s['aktif'])} | terakhir jalan: {terakhir} | job: {s['job_terakhir'] or '-'}")
+    else:
+        queue = JobQueue()
+        job_ids = jadwalkan(queue, sets, args.set_ids)
+        print(f"{len(job_ids)} job delta dijadwalkan: {', '.join(job_ids) or '-'}")
+        if job_ids and not args.tanpa_proses:
+            worker_loop(worker_id=f"terjadwal-{int(time.time())}", sampai_kosong=True, job_ids=job_ids)
+            for job_id in job_ids:
+                job = queue.get(job_id)
+                print(f"{job['judul']}: {job['status']} · {job['jumlah_baris']} berita baru")
@@ -0,0 +1,349 @@
+# --- PIPELINE SCRAPING ---
+# Inti proses scraping tanpa ketergantungan pada Streamlit, sehingga dapat
+# dijalankan di worker latar belakang (lihat jobs.py). Kemajuan, peringatan, dan
+# baris hasil dikirim lewat objek `Reporter`.
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from article_resolver import JALUR_GAGAL, MAKS_ARTIKEL_PARALEL, ArticleInfo, ArticleResolver
+from article_store import ArticleStore
+from browser_pool import UKURAN_POOL_BROWSER, BrowserPool
+from dedupe import LinkHistory, LinkIndex
+from google_news import GoogleNewsFeed
+from governor import get_governor, ringkas_statistik
+from klaster import KlasterBerita
+from live_view import RowBuffer
+from matcher import MultiPatternMatcher
+from search_cache import SearchCache
+from search_engine import MAKS_PENCARIAN_PARALEL, SHARD_BULANAN, SearchPlan, ThroughputMeter, build_search_tasks, run_search_tasks
+from watermark import WatermarkStore, tanggal_terbit
+from telemetry import TAHAP_ARTIKEL, TAHAP_KLASTER, TAHAP_PENCARIAN, TAHAP_PENYARINGAN, TAHAP_RENDER, StageTimer
+
+NAMA_DAERAH = "Konawe Selatan"
+MODE_DENGAN_RINGKASAN = "Dengan Ringkasan (cukup lama)"
+# Dapat diarahkan ke server lokal (lihat benchmark.py).
+GOOGLE_NEWS_BASE_URL = os.environ.get("SKENA_GOOGLE_NEWS_URL", "https://news.google.com/rss")
+# Kata kunci yang gagal dicari dicoba ulang di akhir run; total waktu menunggu host pulih dibatasi.
+MAKS_TUNGGU_PULIH = 300
+
+_browser_pool = None
+_browser_pool_lock = threading.Lock()
+
+
+def get_browser_pool():
+    # Satu pool per proses worker; driver baru dibuat saat pertama kali dibutuhkan.
+    global _browser_pool
+    with _browser_pool_lock:
+        if _browser_pool is None:
+            _browser_pool = BrowserPool(size=UKURAN_POOL_BROWSER)
+        return _browser_pool
+
+
+def tutup_browser_pool():
+    # Pool ditutup (mis. saat aplikasi di-reboot); pool baru dibuat lagi saat dibutuhkan.
+    global _browser_pool
+    with _browser_pool_lock:
+        pool, _browser_pool = _browser_pool, None
+    if pool is not None:
+        pool.close_all()
+
+
+class Reporter:
+    def should_stop(self):
+        return False
+
+    def status(self, info):
+        pass
+
+    def warning(self, pesan):
+        pass
+
+    def rows(self, baris_baru):
+        pass
+
+    def checkpoint(self, urutan_task, jumlah_baris):
+        # Dipanggil setelah satu kata kunci selesai diproses dan barisnya sudah dikirim.
+        pass
+
+
+def format_status(info):
+    menit, detik = divmod(int(info.get('elapsed', 0)), 60)
+    teks = f"⏳ Proses Berjalan: {menit}m {detik}d"
+    if info.get('kategori'):
+        teks += f" | 📁 Kategori {info['kategori_ke']}/{info['total_kategori']}: {info['kategori']}"
+    teks += f" | ⚡ {info.get('per_detik', 0):.2f} kata kunci/detik ({info.get('selesai', 0)}/{info.get('total', 0)})"
+    teks += f" | 🔁 {info.get('query', 0)} query ({info.get('shard', 0)} shard)"
+    teks += f" | 💾 Cache: {info.get('cache_hit', 0)} hit / {info.get('cache_miss', 0)} miss"
+    if info.get('delta') is not None:
+        teks += f" | 🆕 Delta: {info['delta']} link lama dilewati"
+    if info.get('permintaan'):
+        total = ringkas_statistik(info['permintaan'])
+        teks += f" | 🚦 Throttle: {total['throttle']} | 🔂 Retry: {total['retry']}"
+        if total['host_terbuka']:
+            teks += f" | ⛔ Diistirahatkan: {', '.join(total['host_terbuka'])}"
+    return teks
+
+
+def ekstrak_info_artikel(resolver, link_google, keyword):
+    try:
+        with resolver.timer.span(TAHAP_ARTIKEL):
+            return resolver.resolve(link_google, keyword)
+    except Exception:
+        return ArticleInfo(None, "", "", JALUR_GAGAL)
+
+
+def kunci_keyword(keyword):
+    return " ".join(str(keyword).lower().split())
+
+
+def muat_per_klaster(resolver, executor, entries, id_klaster, wakil_klaster, keyword):
+    # Hanya satu entri per klaster yang halamannya dimuat (paralel). Bila gagal, anggota berikutnya
+    # menggantikannya sebagai wakil; anggota lain memakai ringkasan wakil yang berhasil.
+    # `wakil_klaster`: {klaster: {kata kunci: ArticleInfo}}, karena ringkasan bergantung pada kata kunci.
+    # Wakil dari kata kunci lain diringkas ulang dari teks tersimpan tanpa memuat halaman lagi.
+    kunci = kunci_keyword(keyword)
+    for k in dict.fromkeys(id_klaster):
+        per_keyword = wakil_klaster.get(k)
+        if per_keyword and kunci not in per_keyword:
+            inf = resolver.ringkas_ulang(next(iter(per_keyword.values())), keyword)
+            if inf is not None:
+                per_keyword[kunci] = inf
+    info = [None] * len(entries)
+    while True:
+        giliran = {}
+        for i, k in enumerate(id_klaster):
+            if info[i] is None and kunci not in wakil_klaster.get(k, {}) and k not in giliran:
+                giliran[k] = i
+        if not giliran:
+            break
+        hasil = executor.map(lambda i: ekstrak_info_artikel(resolver, entries[i]['link'], keyword), giliran.values())
+        for (k, i), inf in zip(giliran.items(), hasil):
+            info[i] = inf
+            if inf.jalur != JALUR_GAGAL:
+                wakil_klaster.setdefault(k, {})[kunci] = inf
+    return [inf or resolver.dari_klaster(wakil_klaster[k][kunci], e['link'], e['source']) for inf, k, e in zip(info, id_klaster, entries)]
+
+
+def pisah_judul(judul_asli, sumber_cadangan=""):
+    # "Judul - Sumber" -> (judul bersih, sumber); tanpa akhiran sumber, `sumber_cadangan` dipakai.
+    if ' - ' in judul_asli:
+        parts = judul_asli.rsplit(' - ', 1)
+        if len(parts) == 2 and parts[1].strip():
+            return parts[0].strip(), parts[1].strip()
+    return judul_asli, sumber_cadangan
+
+
+def kolom_hasil(mode_ringkasan, mode_riwayat="Tandai"):
+    # "Klaster": Nomor baris pertama dari kelompok berita hampir sama; "Ukuran Klaster": jumlah barisnya.
+    kolom_tabel = ["Nomor", "Kategori", "Kata Kunci", "Judul", "Link", "Tanggal", "Sumber", "Kecamatan", "Klaster", "Ukuran Klaster"]
+    if mode_ringkasan == MODE_DENGAN_RINGKASAN:
+        kolom_tabel += ["Ringkasan", "Jalur"]
+    if mode_riwayat == "Tandai":
+        kolom_tabel.append("Pernah Ditemukan")
+    return kolom_tabel
+
+
+def run_scrape(tanggal_awal, tanggal_akhir, kata_kunci_lapus_df, kata_kunci_daerah_df, mode_ringkasan, reporter=None, mode_riwayat="Tandai", periode=None, bypass_cache=False, max_workers=MAKS_PENCARIAN_PARALEL, batch_query=True, granularitas_shard=SHARD_BULANAN, checkpoint=None, mode_delta=False):
+    # `checkpoint` (opsional): {'selesai': urutan task yang sudah tuntas, 'rows': baris yang sudah diterima}.
+    # `mode_delta`: tiap kata kunci hanya dicari sejak watermark-nya dan hanya link yang belum pernah terlihat diproses.
+    reporter = reporter or Reporter()
+    start_time = time.time()
+    timer = StageTimer()
+    use_summary = (mode_ringkasan == MODE_DENGAN_RINGKASAN)
+    # Chrome hanya dinyalakan (dipinjam dari pool) bila ada link yang gagal diselesaikan lewat HTTP.
+    browser_pool = get_browser_pool() if use_summary else None
+    if browser_pool is not None: browser_pool.health_check()
+    # Pengatur dipakai bersama pencarian dan artikel; statistiknya dihitung sejak awal run ini.
+    governor = get_governor()
+    permintaan_awal = governor.snapshot()
+    resolver = ArticleResolver(browser_fetch=browser_pool.fetch, store=ArticleStore(), timer=timer, governor=governor) if use_summary else None
+    artikel_executor = ThreadPoolExecutor(max_workers=MAKS_ARTIKEL_PARALEL, thread_name_prefix="skena-artikel") if use_summary else None
+
+    kata_kunci_lapus_dict = {c: kata_kunci_lapus_df[c].dropna().astype(str).str.strip().tolist() for c in kata_kunci_lapus_df.columns}
+    nama_daerah = NAMA_DAERAH
+    kecamatan_list = kata_kunci_daerah_df[nama_daerah].dropna().astype(str).str.strip().tolist()
+    lokasi_filter = [nama_daerah] + kecamatan_list
+    gn = GoogleNewsFeed(lang='id', country='ID', base_url=GOOGLE_NEWS_BASE_URL, governor=governor)
+
+    link_index = LinkIndex()
+    riwayat = LinkHistory()
+    def kirim_baris(baris_baru):
+        with timer.span(TAHAP_RENDER):
+            reporter.rows(baris_baru)
+    hasil = RowBuffer(kolom_hasil(mode_ringkasan, mode_riwayat), on_flush=kirim_baris)
+    total_kategori = len(kata_kunci_lapus_dict)
+
+    # Query dijalankan paralel; hasilnya tetap diproses berurutan di thread ini.
+    semua_tasks = build_search_tasks(kata_kunci_lapus_dict, nama_daerah)
+    # Lokasi + seluruh kata kunci aktif dicocokkan dalam satu pemindaian per artikel.
+    matcher = MultiPatternMatcher(lokasi_filter, [t.keyword for t in semua_tasks])
+
+    # Lanjutkan dari checkpoint: kata kunci yang tuntas dilewati, baris & indeks dedupe dipulihkan.
+    sudah_selesai = set((checkpoint or {}).get('selesai', ()))
+    tasks = [t for t in semua_tasks if t.urutan not in sudah_selesai]
+    tuntas_run = set()
+    # Watermark selalu diperbarui (run penuh menjadi titik awal run delta berikutnya).
+    watermark = WatermarkStore()
+    if mode_delta:
+        tasks = [t._replace(awal=watermark.awal_delta(t.keyword, nama_daerah, tanggal_awal, tanggal_akhir)) for t in tasks]
+    dilewati_delta = 0
+    lolos_delta = set()
+    nama_daerah_kunci = nama_daerah.lower()
+    # Judul berita hampir sama dikelompokkan sebelum artikel dimuat (lihat klaster.py).
+    klaster = KlasterBerita(abaikan=lokasi_filter)
+    baris_klaster, wakil_klaster = {}, {}
+    def pembeda_judul(judul):
+        # Kecamatan dan kata kunci yang disebut judul harus sama antar anggota klaster.
+        cocok = matcher.cari(judul)
+        return (cocok.lokasi - {nama_daerah_kunci}) | cocok.keywords
+    hasil.muat((checkpoint or {}).get('rows', []))
+    for i, link in enumerate(hasil.buffer["Link"], 1):
+        link_index.add(link, i)
+    for i, row in enumerate(hasil.baris()):
+        try:
+            tanggal = datetime.strptime(row["Tanggal"], '%d-%m-%Y').date()
+        except (ValueError, TypeError):
+            tanggal = None
+        k = klaster.tempatkan(str(row["Judul"]), tanggal, pembeda_judul(str(row["Judul"])))
+        baris_klaster.setdefault(k, []).append(i)
+        if use_summary and row["Ringkasan"]:
+            wakil_klaster.setdefault(k, {}).setdefault(kunci_keyword(row["Kata Kunci"]), ArticleInfo(row["Link"], row["Ringkasan"], row["Sumber"], row["Jalur"]))
+    meter = ThroughputMeter()
+    cache = SearchCache()
+    def query_fn(query, awal, akhir):
+        with timer.span(TAHAP_PENCARIAN):
+            return cache.search(gn, query, from_=awal, to_=akhir, bypass=bypass_cache)
+    plan = SearchPlan(query_fn, nama_daerah, tanggal_awal, tanggal_akhir, granularitas=granularitas_shard, meter=meter)
+    should_stop = reporter.should_stop
+
+    def hasil_pencarian():
+        # Kata kunci yang tetap gagal setelah retry pengatur tidak langsung digugurkan: dicoba
+        # ulang di akhir run, setelah host yang diistirahatkan circuit breaker pulih.
+        ditunda = []
+        for outcome in run_search_tasks(tasks, plan, max_workers=max_workers, should_stop=should_stop, batch_query=batch_query):
+            if outcome.error is not None:
+                ditunda.append(outcome.task)
+                continue
+            yield outcome
+        if not ditunda or should_stop():
+            return
+        reporter.warning(f"{len(ditunda)} kata kunci gagal dicari; dicoba ulang satu per satu setelah Google News pulih.")
+        # Satu per satu, karena sirkuit setengah terbuka hanya meloloskan satu permintaan percobaan.
+        batas = time.time() + MAKS_TUNGGU_PULIH
+        for task in ditunda:
+            while governor.sisa_jeda(GOOGLE_NEWS_BASE_URL) > 0 and time.time() < batas and not should_stop():
+                time.sleep(0.5)
+            if should_stop():
+                return
+            yield from run_search_tasks([task], plan, max_workers=1, should_stop=should_stop, batch_query=False)
+
+    for task, search_results, error in hasil_pencarian():
+        meter.tick()
+        hasil.maybe_flush()  # Kirim baris tertunda bila interval sudah lewat.
+        kategori, keyword = task.kategori, task.keyword
+
+        reporter.status({
+            'elapsed': time.time() - start_time, 'kategori_ke': task.kategori_ke, 'total_kategori': total_kategori,
+            'kategori': kategori, 'keyword': keyword, 'nama_daerah': nama_daerah,
+            'selesai': len(sudah_selesai) + meter.selesai, 'total': len(semua_tasks), 'per_detik': meter.per_detik,
+            'query': meter.query, 'shard': meter.shard, 'cache_hit': cache.hit, 'cache_miss': cache.miss,
+            'jalur': dict(resolver.stats) if use_summary else None, 'statistik': timer.ringkasan(),
+            'delta': dilewati_delta if mode_delta else None, 'permintaan': governor.statistik(sejak=permintaan_awal),
+        })
+
+        if error is not None:
+            reporter.warning(f"Gagal mencari '{keyword}': {error}")
+            continue
+
+        tuntas = False
+        try:
+            entries = search_results['entries']
+            if mode_delta:
+                # Entri batch yang ditawarkan ke beberapa kata kunci sudah lolos filter di kata kunci pertama.
+                sudah_terlihat = watermark.terlihat(nama_daerah, [e['link'] for e in entries]) - lolos_delta
+                dilewati_delta += len(sudah_terlihat)
+                entries = [e for e in entries if e['link'] not in sudah_terlihat]
+                lolos_delta.update(e['link'] for e in entries)
+            with timer.span(TAHAP_KLASTER):
+                judul_list = [pisah_judul(e['title'])[0] for e in entries]
+                id_klaster = [klaster.tempatkan(j, tanggal_terbit(e['published']), pembeda_judul(j)) for j, e in zip(judul_list, entries)]
+            # Artikel satu kata kunci dimuat paralel; urutan hasil tetap mengikuti urutan feed.
+            info_artikel = muat_per_klaster(resolver, artikel_executor, entries, id_klaster, wakil_klaster, keyword) if use_summary else []
+            for i, entry in enumerate(entries):
+                if should_stop(): break
+                if use_summary:
+                    link_final, ringkasan, sumber_dari_url, jalur = info_artikel[i]
+                else:
+                    link_final, ringkasan, sumber_dari_url, jalur = entry['link'], "", entry['source'], None
+
+                with timer.span(TAHAP_PENYARINGAN):
+                    if not link_final or link_final in link_index or entry['link'] in link_index: continue
+                    periode_lama = riwayat.periode_pertama(link_final)
+                    if periode_lama == periode: periode_lama = None  # Run ulang periode yang sama bukan riwayat.
+                    if periode_lama and mode_riwayat == "Lewati": continue
+
+                    judul_bersih, sumber_final = pisah_judul(entry['title'], sumber_dari_url)
+
+                    cocok = matcher.cari(judul_bersih, ringkasan)
+                    lokasi_ditemukan = bool(cocok.lokasi)
+                    keyword_ditemukan = " ".join(keyword.lower().split()) in cocok.keywords
+                    label_keyword = keyword
+                    kandidat = entry.get('kandidat')
+                    if kandidat and not keyword_ditemukan:
+                        # Entri batch tanpa kata kunci di judul/deskripsi: diterima oleh kandidat pertama yang
+                        # kata kuncinya ada di judul/ringkasan; bila tidak ada, kandidat terakhir menerimanya
+                        # lewat lokasi dengan semua kandidat sebagai Kata Kunci.
+                        if keyword != kandidat[-1]: continue
+                        label_keyword = " / ".join(kandidat)
+
+                if lokasi_ditemukan or keyword_ditemukan:
+                    try:
+                        tanggal_dt = datetime.strptime(entry['published'], '%a, %d %b %Y %H:%M:%S %Z')
+                        tanggal_str = tanggal_dt.strftime('%d-%m-%Y')
+                    except (ValueError, TypeError):
+                        tanggal_str = "N/A"
+
+                    nomor = len(hasil) + 1
+                    anggota = baris_klaster.setdefault(id_klaster[i], [])
+                    new_data = {"Nomor": nomor, "Kategori": kategori, "Kata Kunci": label_keyword, "Judul": judul_bersih, "Link": link_final, "Tanggal": tanggal_str, "Sumber": sumber_final, "Kecamatan": ", ".join(sorted(matcher.nama_asli(k) for k in cocok.lokasi if k != nama_daerah_kunci)),
+                                "Klaster": hasil.buffer["Nomor"][anggota[0]] if anggota else nomor, "Ukuran Klaster": len(anggota) + 1}
+                    if use_summary: new_data.update({"Ringkasan": ringkasan, "Jalur": jalur})
+
+                    if mode_riwayat == "Tandai": new_data["Pernah Ditemukan"] = periode_lama or ""
+
+                    link_index.add(link_final, nomor)
+                    link_index.add(entry['link'], nomor)
+                    # Baris klaster yang sudah terkirim ikut diperbarui ukurannya.
+                    for j in anggota:
+                        hasil.ubah(j, "Ukuran Klaster", len(anggota) + 1)
+                    anggota.append(len(hasil))
+                    hasil.append(new_data)
+            tuntas = not should_stop()
+        except Exception as e:
+            reporter.warning(f"Gagal mencari '{keyword}': {e}")
+            continue
+
+        if tuntas:
+            tuntas_run.add(task.urutan)
+            watermark.perbarui(keyword, nama_daerah, entries, task.awal or tanggal_awal, tanggal_akhir)
+            hasil.maybe_flush(paksa=True)
+            reporter.checkpoint(task.urutan, len(hasil))
+
+    # Simpan link run ini agar run berikutnya (mis. triwulan lain) dapat menandai/melewatinya.
+    if periode and not should_stop():
+        riwayat.simpan(hasil.buffer["Link"], periode)
+    if artikel_executor is not None:
+        artikel_executor.shutdown(wait=False, cancel_futures=True)
+    hasil.maybe_flush(paksa=len(hasil) > 0)
+    hasil_df = hasil.to_dataframe()
+    hasil_df.attrs['waktu_render'] = hasil.waktu_flush
+    hasil_df.attrs['waktu_scraping'] = time.time() - start_time - hasil.waktu_flush
+    hasil_df.attrs['statistik'] = timer.ringkasan()
+    hasil_df.attrs['permintaan'] = governor.statistik(sejak=permintaan_awal)
+    # Kata kunci yang tetap gagal (juga setelah dicoba ulang); job dengan kata kunci gagal dapat dilanjutkan.
+    hasil_df.attrs['kata_kunci_gagal'] = [] if should_stop() else [t.keyword for t in tasks if t.urutan not in tuntas_run]
+    return hasil_df
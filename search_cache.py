@@ -0,0 +1,98 @@
+# --- CACHE HASIL PENCARIAN ---
+# Cache SQLite di depan `gn.search`, dikunci oleh (query, from_, to_, lang, country).
+# Jendela tanggal yang sudah lewat (triwulan tertutup) tidak pernah kedaluwarsa;
+# jendela yang mencakup hari ini atau baru saja berakhir hanya disimpan sebentar.
+
+import hashlib
+import html
+import json
+import re
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+from storage import buka_db
+
+TTL_JENDELA_AKTIF = 30 * 60
+# Google News masih mengindeks berita beberapa hari setelah terbit; jendela dianggap tertutup
+# setelah masa tenggang ini.
+MASA_TENGGANG_JENDELA = timedelta(days=3)
+POLA_TAG = re.compile(r"<[^>]+>")
+
+
+def normalisasi_entry(entry):
+    source = entry.get('source') or {}
+    return {
+        'title': entry.get('title', ""),
+        'link': entry.get('link', ""),
+        'published': entry.get('published', ""),
+        'source': source.get('title', "") if isinstance(source, dict) else "",
+        # Deskripsi RSS (HTML) sebagai teks biasa; dipakai untuk atribusi kata kunci query batch.
+        'description': " ".join(html.unescape(POLA_TAG.sub(" ", entry.get('summary') or "")).split()),
+    }
+
+
+def ttl_untuk(to_, hari_ini=None):
+    hari_ini = hari_ini or date.today()
+    try:
+        akhir = datetime.strptime(str(to_), '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        return TTL_JENDELA_AKTIF
+    return None if akhir + MASA_TENGGANG_JENDELA < hari_ini else TTL_JENDELA_AKTIF
+
+
+class SearchCache:
+    def __init__(self, nama_db="cache_pencarian.sqlite"):
+        self._conn = buka_db(nama_db)
+        self._lock = threading.Lock()
+        self.hit = 0
+        self.miss = 0
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_pencarian ("
+            " kunci TEXT PRIMARY KEY, query TEXT, from_ TEXT, to_ TEXT, lang TEXT, country TEXT,"
+            " dibuat REAL, kedaluwarsa REAL, entries TEXT)"
+        )
+
+    @staticmethod
+    def kunci(query, from_, to_, lang, country):
+        raw = json.dumps([query, str(from_), str(to_), lang, country], ensure_ascii=False)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def get(self, query, from_, to_, lang, country):
+        kunci = self.kunci(query, from_, to_, lang, country)
+        with self._lock:
+            row = self._conn.execute("SELECT kedaluwarsa, entries FROM cache_pencarian WHERE kunci = ?", (kunci,)).fetchone()
+            if row is None or (row[0] is not None and row[0] < time.time()):
+                self.miss += 1
+                return None
+            self.hit += 1
+        return json.loads(row[1])
+
+    def put(self, query, from_, to_, lang, country, entries):
+        ttl = ttl_untuk(to_)
+        sekarang = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_pencarian VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (self.kunci(query, from_, to_, lang, country), query, str(from_), str(to_), lang, country,
+                 sekarang, None if ttl is None else sekarang + ttl, json.dumps(entries, ensure_ascii=False)),
+            )
+
+    def purge(self, hanya_kedaluwarsa=False):
+        with self._lock, self._conn:
+            if hanya_kedaluwarsa:
+                cur = self._conn.execute("DELETE FROM cache_pencarian WHERE kedaluwarsa IS NOT NULL AND kedaluwarsa < ?", (time.time(),))
+            else:
+                cur = self._conn.execute("DELETE FROM cache_pencarian")
+        return cur.rowcount
+
+    def search(self, gn, query, from_=None, to_=None, bypass=False):
+        # Pengganti `gn.search` yang mengembalikan {'entries': [dict, ...]}.
+        if not bypass:
+            entries = self.get(query, from_, to_, gn.lang, gn.country)
+            if entries is not None:
+                return {'entries': entries}
+        hasil = gn.search(query, from_=from_, to_=to_)
+        entries = [normalisasi_entry(e) for e in hasil['entries']]
+        self.put(query, from_, to_, gn.lang, gn.country, entries)
+        return {'entries': entries}
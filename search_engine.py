@@ -0,0 +1,241 @@
+# --- MESIN PENCARIAN PARALEL ---
+# Menjalankan banyak query Google News sekaligus dengan thread pool terbatas.
+# Kata kunci dapat dikemas menjadi query OR (batch) lalu hasilnya diatribusikan
+# kembali ke kata kunci masing-masing secara lokal. Query yang jenuh di batas feed
+# dipecah per jendela tanggal secara paralel. Hasil tetap dikembalikan
+# sesuai urutan (kategori, kata kunci) aslinya sehingga penomoran tabel stabil.
+
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
+
+from matcher import MultiPatternMatcher
+
+MAKS_PENCARIAN_PARALEL = 6
+# Perencana batch: beberapa kata kunci digabung menjadi satu query OR.
+MAKS_PANJANG_QUERY = 250
+MAKS_KATA_KUNCI_PER_BATCH = 8
+BATAS_FEED = 100  # Feed RSS Google News berhenti di sekitar 100 entri.
+# Sharding rentang tanggal untuk query yang jenuh (hasil mentok di BATAS_FEED).
+SHARD_BULANAN = "bulanan"
+SHARD_MINGGUAN = "mingguan"
+SHARD_TANPA = "tanpa"
+MAKS_SHARD_PARALEL = 4
+
+# `awal` (opsional): awal jendela khusus task ini (mode delta); None berarti awal rentang run.
+SearchTask = namedtuple("SearchTask", ["urutan", "kategori_ke", "kategori", "keyword", "query", "awal"], defaults=(None,))
+SearchOutcome = namedtuple("SearchOutcome", ["task", "result", "error"])
+
+
+def build_query(keywords, nama_daerah):
+    if len(keywords) == 1:
+        return f'"{keywords[0]}" "{nama_daerah}"'
+    return "(" + " OR ".join(f'"{k}"' for k in keywords) + f') "{nama_daerah}"'
+
+
+def build_search_tasks(kata_kunci_lapus_dict, nama_daerah):
+    tasks = []
+    for kategori_ke, (kategori, kata_kunci_list) in enumerate(kata_kunci_lapus_dict.items(), 1):
+        for keyword_raw in kata_kunci_list:
+            keyword = str(keyword_raw).strip()
+            if not keyword: continue
+            tasks.append(SearchTask(len(tasks), kategori_ke, kategori, keyword, build_query([keyword], nama_daerah)))
+    return tasks
+
+
+def plan_batches(tasks, nama_daerah, max_len=MAKS_PANJANG_QUERY, max_keywords=MAKS_KATA_KUNCI_PER_BATCH):
+    # Kata kunci berurutan dalam kategori (dan jendela tanggal) yang sama dikemas selama query masih di bawah batas panjang.
+    batches, batch = [], []
+    for task in tasks:
+        kandidat = batch + [task]
+        terlalu_besar = len(kandidat) > max_keywords or len(build_query([t.keyword for t in kandidat], nama_daerah)) > max_len
+        if batch and (task.kategori != batch[0].kategori or task.awal != batch[0].awal or terlalu_besar):
+            batches.append(batch)
+            batch = [task]
+        else:
+            batch = kandidat
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def attribute_entries(batch, entries):
+    # Entri ditawarkan ke setiap kata kunci yang disebut judul/deskripsinya, berurutan seperti mode per
+    # kata kunci: penyaringan relevansi di pipeline memutuskan kata kunci mana yang menerimanya (link yang
+    # sudah diterima dilewati kata kunci berikutnya). Entri yang kata kuncinya hanya ada di isi artikel
+    # ditawarkan ke semua kata kunci batch dengan penanda `kandidat` (lihat pipeline).
+    hasil = {t.urutan: [] for t in batch}
+    matcher = MultiPatternMatcher((), [t.keyword for t in batch])
+    kandidat = [t.keyword for t in batch]
+    for entry in entries:
+        cocok = matcher.cari(entry['title'], entry.get('description', ''))
+        target = [t for t in batch if " ".join(t.keyword.lower().split()) in cocok.keywords]
+        if not target:
+            target, entry = batch, dict(entry, kandidat=kandidat)
+        for t in target:
+            hasil[t.urutan].append(entry)
+    return hasil
+
+
+class ThroughputMeter:
+    def __init__(self):
+        self.start = time.time()
+        self.selesai = 0
+        self.query = 0
+        self.split = 0
+        self.shard = 0
+        self._lock = threading.Lock()
+
+    def tick(self, n=1):
+        self.selesai += n
+
+    def catat(self, query=0, split=0, shard=0):
+        with self._lock:
+            self.query += query
+            self.split += split
+            self.shard += shard
+
+    @property
+    def per_detik(self):
+        elapsed = time.time() - self.start
+        return self.selesai / elapsed if elapsed > 0 else 0.0
+
+
+def _tanggal(teks):
+    return datetime.strptime(str(teks), '%Y-%m-%d').date()
+
+
+def split_window(awal, akhir, granularitas=SHARD_BULANAN):
+    # Memecah rentang menjadi sub-jendela kalender. Batas jendela sengaja bertumpuk satu
+    # hari agar tidak ada tanggal yang terlewat; duplikat dibuang saat penggabungan.
+    mulai, selesai = _tanggal(awal), _tanggal(akhir)
+    jendela = []
+    while mulai < selesai:
+        if granularitas == SHARD_MINGGUAN:
+            batas = mulai + timedelta(days=7)
+        else:
+            batas = (mulai.replace(day=1) + timedelta(days=32)).replace(day=1)
+        batas = min(batas, selesai)
+        jendela.append((mulai.isoformat(), batas.isoformat()))
+        mulai = batas
+    return jendela or [(str(awal), str(akhir))]
+
+
+def bisect_window(awal, akhir):
+    mulai, selesai = _tanggal(awal), _tanggal(akhir)
+    if (selesai - mulai).days < 2:
+        return None
+    tengah = mulai + (selesai - mulai) / 2
+    return [(mulai.isoformat(), tengah.isoformat()), (tengah.isoformat(), selesai.isoformat())]
+
+
+def merge_entries(kelompok):
+    hasil, terlihat = [], set()
+    for entries in kelompok:
+        for entry in entries:
+            if entry['link'] in terlihat: continue
+            terlihat.add(entry['link'])
+            hasil.append(entry)
+    return hasil
+
+
+class SearchPlan:
+    # Konfigurasi satu run: `query_fn(query, from_, to_)` harus mengembalikan {'entries': [...]}.
+    def __init__(self, query_fn, nama_daerah, awal, akhir, granularitas=SHARD_BULANAN, meter=None, shard_executor=None):
+        self.query_fn = query_fn
+        self.nama_daerah = nama_daerah
+        self.awal = awal
+        self.akhir = akhir
+        self.granularitas = granularitas
+        self.meter = meter or ThroughputMeter()
+        self.shard_executor = shard_executor
+
+    def query(self, query, awal, akhir):
+        entries = self.query_fn(query, awal, akhir)['entries']
+        self.meter.catat(query=1)
+        return entries
+
+    def _bisect(self, query, awal, akhir, entries):
+        # Jendela jenuh dibelah dua secara rekursif sampai tidak jenuh atau tinggal satu hari.
+        if len(entries) < BATAS_FEED:
+            return entries
+        halves = bisect_window(awal, akhir)
+        if halves is None:
+            return entries
+        self.meter.catat(shard=1)
+        return merge_entries([self._bisect(query, a, b, self.query(query, a, b)) for a, b in halves])
+
+    def _cari_shard(self, query, awal, akhir):
+        return self._bisect(query, awal, akhir, self.query(query, awal, akhir))
+
+    def shard(self, query, entries, awal=None):
+        # Dipanggil bila query satu kata kunci mentok di batas feed untuk seluruh rentang.
+        awal = awal or self.awal
+        if self.granularitas == SHARD_TANPA or len(entries) < BATAS_FEED:
+            return entries
+        jendela = split_window(awal, self.akhir, self.granularitas)
+        if len(jendela) == 1:
+            return self._bisect(query, awal, self.akhir, entries)
+        self.meter.catat(shard=len(jendela))
+        if self.shard_executor is not None:
+            kelompok = list(self.shard_executor.map(lambda w: self._cari_shard(query, *w), jendela))
+        else:
+            kelompok = [self._cari_shard(query, a, b) for a, b in jendela]
+        return merge_entries(kelompok)
+
+
+def search_batch(batch, plan):
+    # Mengembalikan {urutan_task: [entry, ...]}. Batch yang mentok di batas feed dibelah dua
+    # per kata kunci; satu kata kunci yang masih jenuh dipecah per jendela tanggal.
+    awal = batch[0].awal or plan.awal
+    if len(batch) == 1:
+        query = batch[0].query
+        return {batch[0].urutan: plan.shard(query, plan.query(query, awal, plan.akhir), awal)}
+    entries = plan.query(build_query([t.keyword for t in batch], plan.nama_daerah), awal, plan.akhir)
+    if len(entries) < BATAS_FEED:
+        return attribute_entries(batch, entries)
+    plan.meter.catat(split=1)
+    tengah = len(batch) // 2
+    hasil = search_batch(batch[:tengah], plan)
+    hasil.update(search_batch(batch[tengah:], plan))
+    return hasil
+
+
+def run_search_tasks(tasks, plan, max_workers=MAKS_PENCARIAN_PARALEL, should_stop=None, batch_query=True, max_len=MAKS_PANJANG_QUERY, poll_interval=0.2):
+    # Generator: menghasilkan SearchOutcome per task, berurutan sesuai `tasks`.
+    # Worker hanya memanggil `plan.query_fn`; seluruh pemrosesan hasil (dan
+    # pemanggilan Streamlit) tetap di thread pemanggil.
+    should_stop = should_stop or (lambda: False)
+    if not tasks:
+        return
+    batches = plan_batches(tasks, plan.nama_daerah, max_len=max_len) if batch_query else [[t] for t in tasks]
+    executor = ThreadPoolExecutor(max_workers=max(1, int(max_workers)), thread_name_prefix="skena-search")
+    # Pool terpisah untuk shard tanggal, agar worker pencarian yang menunggu shard tidak saling mengunci.
+    # Pool dibuat dan ditutup oleh pemanggil ini saja; `plan` yang sama boleh dipakai ulang (pencarian ulang kata kunci tertunda).
+    pool_shard_sendiri = plan.shard_executor is None and plan.granularitas != SHARD_TANPA
+    if pool_shard_sendiri:
+        plan.shard_executor = ThreadPoolExecutor(max_workers=MAKS_SHARD_PARALEL, thread_name_prefix="skena-shard")
+    try:
+        futures = [executor.submit(search_batch, batch, plan) for batch in batches]
+        for batch, future in zip(batches, futures):
+            while True:
+                if should_stop():
+                    return
+                try:
+                    hasil = future.result(timeout=poll_interval)
+                except FuturesTimeout:
+                    continue
+                except Exception as e:
+                    for task in batch:
+                        yield SearchOutcome(task, None, e)
+                    break
+                for task in batch:
+                    yield SearchOutcome(task, {'entries': hasil.get(task.urutan, [])}, None)
+                break
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        if pool_shard_sendiri:
+            plan.shard_executor.shutdown(wait=False, cancel_futures=True)
+            plan.shard_executor = None
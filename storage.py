@@ -0,0 +1,19 @@
+# --- PENYIMPANAN LOKAL ---
+# Lokasi data lokal aplikasi (cache, indeks, riwayat) dan pembuka koneksi SQLite.
+
+import os
+import sqlite3
+
+DATA_DIR = os.environ.get("SKENA_DATA_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".skena_data"))
+
+
+def data_path(nama):
+    os.makedirs(DATA_DIR, exist_ok=True)
+    return os.path.join(DATA_DIR, nama)
+
+
+def buka_db(nama):
+    conn = sqlite3.connect(data_path(nama), timeout=30, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
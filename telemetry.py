@@ -0,0 +1,91 @@
+# --- STATISTIK PROSES PER TAHAP ---
+# Pengukur waktu ringan untuk setiap tahap pipeline (pencarian, klaster judul,
+# resolusi link, pemuatan halaman, parsing, pemilihan ringkasan, penyaringan, render). Durasi
+# dikumpulkan per run lalu diringkas menjadi jumlah, total, dan persentil.
+
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+TAHAP_PENCARIAN = "pencarian"
+TAHAP_KLASTER = "klaster_judul"
+TAHAP_ARTIKEL = "artikel"
+TAHAP_PENYIMPANAN = "artikel_tersimpan"
+TAHAP_RESOLUSI = "resolusi_link"
+TAHAP_MUAT_HTTP = "muat_halaman_http"
+TAHAP_MUAT_BROWSER = "muat_halaman_browser"
+TAHAP_PARSING = "parsing"
+TAHAP_RINGKASAN = "pilih_ringkasan"
+TAHAP_PENYARINGAN = "penyaringan"
+TAHAP_RENDER = "render"
+URUTAN_TAHAP = [
+    TAHAP_PENCARIAN, TAHAP_KLASTER, TAHAP_ARTIKEL, TAHAP_PENYIMPANAN, TAHAP_RESOLUSI, TAHAP_MUAT_HTTP, TAHAP_MUAT_BROWSER,
+    TAHAP_PARSING, TAHAP_RINGKASAN, TAHAP_PENYARINGAN, TAHAP_RENDER,
+]
+MAKS_SAMPEL = 5000  # Persentil dihitung dari sampel acak (reservoir) agar memori tetap kecil.
+
+
+def persentil(urut, p):
+    if not urut:
+        return 0.0
+    k = (len(urut) - 1) * p / 100
+    f = int(k)
+    c = min(f + 1, len(urut) - 1)
+    return urut[f] + (urut[c] - urut[f]) * (k - f)
+
+
+class _Tahap:
+    __slots__ = ("jumlah", "total", "maks", "sampel")
+
+    def __init__(self):
+        self.jumlah = 0
+        self.total = 0.0
+        self.maks = 0.0
+        self.sampel = []
+
+
+class StageTimer:
+    def __init__(self, maks_sampel=MAKS_SAMPEL):
+        self.maks_sampel = maks_sampel
+        self._tahap = {}
+        self._lock = threading.Lock()
+        self._rng = random.Random(0)
+
+    def catat(self, tahap, detik):
+        with self._lock:
+            t = self._tahap.get(tahap)
+            if t is None:
+                t = self._tahap[tahap] = _Tahap()
+            t.jumlah += 1
+            t.total += detik
+            t.maks = max(t.maks, detik)
+            if len(t.sampel) < self.maks_sampel:
+                t.sampel.append(detik)
+            else:
+                i = self._rng.randrange(t.jumlah)
+                if i < self.maks_sampel:
+                    t.sampel[i] = detik
+
+    @contextmanager
+    def span(self, tahap):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.catat(tahap, time.perf_counter() - t0)
+
+    def ringkasan(self):
+        # {tahap: {jumlah, total_s, rata_ms, p50_ms, p95_ms, maks_ms}}, diurutkan sesuai alur pipeline.
+        with self._lock:
+            salinan = {k: (t.jumlah, t.total, t.maks, sorted(t.sampel)) for k, t in self._tahap.items()}
+        urutan = [k for k in URUTAN_TAHAP if k in salinan] + sorted(k for k in salinan if k not in URUTAN_TAHAP)
+        hasil = {}
+        for tahap in urutan:
+            jumlah, total, maks, urut = salinan[tahap]
+            hasil[tahap] = {
+                "jumlah": jumlah, "total_s": round(total, 3), "rata_ms": round(total / jumlah * 1000, 1) if jumlah else 0.0,
+                "p50_ms": round(persentil(urut, 50) * 1000, 1), "p95_ms": round(persentil(urut, 95) * 1000, 1),
+                "maks_ms": round(maks * 1000, 1),
+            }
+        return hasil
@@ -0,0 +1,168 @@
+# --- EKSTRAKSI TEKS ARTIKEL ---
+# Parser inkremental lxml (HTMLPullParser) dengan batas ukuran HTML. Hanya <p>
+# di luar navigasi/footer/sidebar yang dibaca, dan paragraf di dalam kontainer
+# artikel utama (<article>, itemprop=articleBody, class/id "content", "detail",
+# dst.) didahulukan. Dalam mode ringkasan, parsing berhenti begitu kalimat yang
+# memuat kata kunci ditemukan di kontainer utama. Bila tidak ada paragraf yang
+# lolos, seluruh <p> (termasuk yang dilewati) dipakai sebagai cadangan.
+
+import re
+from collections import deque, namedtuple
+from itertools import chain, islice
+
+from lxml import etree
+
+MAKS_BYTE_HTML = 768 * 1024
+MAKS_KARAKTER_TEKS = 20000
+UKURAN_POTONGAN = 64 * 1024
+KALIMAT_KONTEKS = 1
+MAKS_PANJANG_RINGKASAN = 600
+
+TAG_DILEWATI = {"script", "style", "noscript", "nav", "header", "footer", "aside", "form", "iframe", "svg", "button", "select", "template"}
+# Dicocokkan per token class/id dari awal token: "sidebar-kanan" dilewati, tetapi pembungkus tata letak
+# seperti "right-sidebar" atau "has-sidebar" di sekitar <article> tidak.
+POLA_DILEWATI = re.compile(r"(?:sidebar|related|terkait|baca-?juga|read-?also|komentar|comments?|share|social|iklan|advert\w*|ads?|breadcrumbs?|menu|footer|navbar|newsletter|popular|terpopuler|tag-?list)(?:[-_][\w-]*)?", re.I)
+POLA_KONTEN = re.compile(r"article|artikel|content|konten|post|entry|detail|story|body|isi|berita|txt", re.I)
+POLA_BATAS_KALIMAT = re.compile(r"(?<=[.!?])\s+")
+
+# `berhenti_awal`: parsing dihentikan karena kalimat kata kunci sudah ditemukan di kontainer utama.
+HasilEkstraksi = namedtuple("HasilEkstraksi", ["teks", "ringkasan", "berhenti_awal"])
+
+
+def _kalimat(teks):
+    mulai = 0
+    for m in POLA_BATAS_KALIMAT.finditer(teks):
+        yield teks[mulai:m.start()]
+        mulai = m.end()
+    if mulai < len(teks):
+        yield teks[mulai:]
+
+
+def _gabung(kalimat_list):
+    ringkasan = " ".join(k.strip() for k in kalimat_list if k.strip())
+    return ringkasan if len(ringkasan) <= MAKS_PANJANG_RINGKASAN else ringkasan[:MAKS_PANJANG_RINGKASAN].rsplit(" ", 1)[0] + "…"
+
+
+def cari_kalimat(teks, keyword, konteks=KALIMAT_KONTEKS):
+    # Kalimat pertama yang memuat kata kunci + `konteks` kalimat sebelum/sesudahnya; None bila tidak ada.
+    kunci = keyword.lower()
+    sebelum = deque(maxlen=konteks)
+    kalimat_iter = _kalimat(teks)
+    for kalimat in kalimat_iter:
+        if kunci in kalimat.lower():
+            return _gabung([*sebelum, kalimat, *islice(kalimat_iter, konteks)])
+        sebelum.append(kalimat)
+    return None
+
+
+def pilih_ringkasan(teks_artikel, keyword, konteks=KALIMAT_KONTEKS):
+    if not teks_artikel:
+        return ""
+    ringkasan = cari_kalimat(teks_artikel, keyword, konteks)
+    if ringkasan is None:
+        ringkasan = _gabung(islice(_kalimat(teks_artikel), konteks + 1))
+    return ringkasan
+
+
+class _Pembaca:
+    # Mengumpulkan paragraf dari event start/end parser; paragraf kontainer utama dipisah dari sisanya.
+    def __init__(self, keyword):
+        self.keyword = keyword
+        self.stack = []
+        self.lewati = 0
+        self.konten = 0
+        self.dalam_p = 0
+        self.paragraf_konten, self.paragraf_lain, self.paragraf_dilewati = [], [], []
+        self.panjang = self.panjang_dilewati = 0
+        self.ringkasan = None
+
+    def mulai(self, tag, el):
+        kelas = f"{el.get('class', '')} {el.get('id', '')}"
+        artikel = tag in ("article", "main") or el.get("itemprop") == "articleBody"
+        lewati_kelas = not artikel and tag not in ("html", "body") and any(POLA_DILEWATI.fullmatch(t) for t in kelas.split())
+        if artikel and self.lewati:
+            # Kontainer artikel di dalam elemen yang dilewati karena class: pembungkus itu ternyata bukan sidebar.
+            for entri in self.stack:
+                if entri[3]:
+                    entri[0] = entri[3] = False
+                    self.lewati -= 1
+        lewati = tag in TAG_DILEWATI or lewati_kelas
+        konten = artikel or bool(POLA_KONTEN.search(kelas))
+        self.stack.append([lewati, konten, tag == "p", lewati_kelas and tag not in TAG_DILEWATI])
+        self.lewati += lewati
+        self.konten += konten
+        self.dalam_p += tag == "p"
+
+    def selesai(self, tag, el):
+        # Mengembalikan True bila parsing boleh dihentikan.
+        if not self.stack:
+            return False
+        lewati, konten, p, _ = self.stack.pop()
+        self.lewati -= lewati
+        self.konten -= konten
+        self.dalam_p -= p
+        if p and self.lewati:
+            teks = " ".join("".join(el.itertext()).split())
+            if teks and self.panjang_dilewati < MAKS_KARAKTER_TEKS:
+                self.paragraf_dilewati.append(teks)
+                self.panjang_dilewati += len(teks) + 1
+        elif p:
+            teks = " ".join("".join(el.itertext()).split())
+            if teks:
+                dalam_konten = self.konten > 0
+                (self.paragraf_konten if dalam_konten else self.paragraf_lain).append(teks)
+                self.panjang += len(teks) + 1
+                if self.keyword and dalam_konten and self.ringkasan is None:
+                    self.ringkasan = cari_kalimat(teks, self.keyword)
+                    if self.ringkasan is not None:
+                        return True
+        if not self.dalam_p:
+            # Elemen yang sudah dibaca dibuang agar memori tetap kecil pada halaman besar.
+            el.clear(keep_tail=True)
+            parent = el.getparent()
+            while parent is not None and el.getprevious() is not None:
+                del parent[0]
+        return self.panjang >= MAKS_KARAKTER_TEKS
+
+    def teks(self):
+        paragraf = self.paragraf_konten or self.paragraf_lain or self.paragraf_dilewati
+        return " ".join(paragraf)[:MAKS_KARAKTER_TEKS]
+
+
+def _baca_event(parser, pembaca):
+    for event, el in parser.read_events():
+        if not isinstance(el.tag, str):
+            continue
+        if event == "start":
+            pembaca.mulai(el.tag.lower(), el)
+        elif pembaca.selesai(el.tag.lower(), el):
+            return True
+    return False
+
+
+def ekstrak_artikel(html, keyword=None, maks_byte=MAKS_BYTE_HTML):
+    # Dengan `keyword`, berhenti di kalimat kata kunci pertama dalam kontainer utama.
+    if not html:
+        return HasilEkstraksi("", "", False)
+    pembaca = _Pembaca(keyword)
+    parser = etree.HTMLPullParser(events=("start", "end"), no_network=True, remove_comments=True)
+    html = html[:maks_byte]
+    potongan = (html[i:i + UKURAN_POTONGAN] for i in range(0, len(html), UKURAN_POTONGAN))
+    for bagian in chain(potongan, [None]):
+        try:
+            if bagian is not None:
+                parser.feed(bagian)
+            else:
+                parser.close()  # Tutup tag yang masih terbuka di akhir dokumen.
+        except etree.LxmlError:
+            break
+        if _baca_event(parser, pembaca):
+            break
+    teks = pembaca.teks()
+    if pembaca.ringkasan is not None:
+        return HasilEkstraksi(teks, pembaca.ringkasan, True)
+    return HasilEkstraksi(teks, pilih_ringkasan(teks, keyword) if keyword else "", False)
+
+
+def ekstrak_teks(html, maks_byte=MAKS_BYTE_HTML):
+    return ekstrak_artikel(html, maks_byte=maks_byte).teks
@@ -0,0 +1,109 @@
+# --- WATERMARK MODE DELTA ---
+# Per pasangan (kata kunci, daerah) disimpan tanggal terbit berita terbaru yang
+# pernah terlihat, rentang tanggal yang sudah tercakup run sebelumnya, dan link
+# feed yang sudah terlihat. Run delta hanya mencari mulai dari watermark dan hanya
+# memproses link yang belum pernah terlihat di daerah tersebut.
+
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+from dedupe import canonicalize_url
+from storage import buka_db
+
+# Jendela delta dimulai sedikit sebelum watermark: berita sering baru terindeks beberapa hari kemudian.
+TUMPANG_TINDIH_HARI = 2
+
+
+def tanggal_terbit(published):
+    try:
+        return datetime.strptime(published, '%a, %d %b %Y %H:%M:%S %Z').date()
+    except (ValueError, TypeError):
+        return None
+
+
+class WatermarkStore:
+    def __init__(self, nama_db="watermark.sqlite"):
+        self._conn = buka_db(nama_db)
+        self._lock = threading.Lock()
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS watermark ("
+                " keyword TEXT, daerah TEXT, terbaru TEXT, dicek_dari TEXT, dicek_sampai TEXT, diperbarui REAL, PRIMARY KEY (keyword, daerah))"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS link_terlihat (keyword TEXT, daerah TEXT, kanonik TEXT, PRIMARY KEY (keyword, daerah, kanonik))"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_link_terlihat_daerah ON link_terlihat (daerah, kanonik)")
+
+    @staticmethod
+    def _kunci(keyword):
+        return " ".join(str(keyword).lower().split())
+
+    def get(self, keyword, daerah):
+        # Mengembalikan (terbaru, dicek_dari, dicek_sampai) sebagai string ISO, atau (None, None, None).
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT terbaru, dicek_dari, dicek_sampai FROM watermark WHERE keyword = ? AND daerah = ?", (self._kunci(keyword), daerah),
+            ).fetchone()
+        return tuple(row) if row else (None, None, None)
+
+    def awal_delta(self, keyword, daerah, awal, akhir):
+        # Awal jendela pencarian delta, dibatasi ke [awal, akhir] rentang run. Bila awal rentang
+        # belum pernah tercakup (mis. triwulan lain), seluruh rentang tetap dicari.
+        terbaru, dicek_dari, dicek_sampai = self.get(keyword, daerah)
+        if not dicek_dari or dicek_dari > str(awal):
+            return awal
+        acuan = min(terbaru, dicek_sampai) if terbaru else dicek_sampai
+        mulai = (datetime.strptime(acuan, '%Y-%m-%d').date() - timedelta(days=TUMPANG_TINDIH_HARI)).isoformat()
+        return min(max(mulai, str(awal)), str(akhir))
+
+    def terlihat(self, daerah, links):
+        # Subset `links` yang sudah pernah terlihat di daerah ini. Sengaja tidak per kata kunci: pada
+        # query batch, entri yang sama dapat diatribusikan ke kata kunci lain antar run.
+        kanonik = {canonicalize_url(l): l for l in links if l}
+        if not kanonik:
+            return set()
+        hasil = set()
+        daftar = list(kanonik)
+        with self._lock:
+            for i in range(0, len(daftar), 500):
+                bagian = daftar[i:i + 500]
+                rows = self._conn.execute(
+                    f"SELECT DISTINCT kanonik FROM link_terlihat WHERE daerah = ? AND kanonik IN ({','.join('?' * len(bagian))})",
+                    (daerah, *bagian),
+                ).fetchall()
+                hasil.update(kanonik[r[0]] for r in rows)
+        return hasil
+
+    def perbarui(self, keyword, daerah, entries, dicek_dari, dicek_sampai):
+        # Dipanggil setelah entri satu kata kunci (jendela [dicek_dari, dicek_sampai]) selesai diproses.
+        kunci = self._kunci(keyword)
+        tanggal = [t for t in (tanggal_terbit(e.get('published')) for e in entries) if t]
+        terbaru_baru = max(tanggal).isoformat() if tanggal else None
+        # Rentang run boleh melewati hari ini (akhir triwulan berjalan); yang benar-benar dicek hanya sampai hari ini.
+        dari, sampai = str(dicek_dari), min(str(dicek_sampai), date.today().isoformat())
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT terbaru, dicek_dari, dicek_sampai FROM watermark WHERE keyword = ? AND daerah = ?", (kunci, daerah)).fetchone()
+            terbaru_lama, dari_lama, sampai_lama = row if row else (None, None, None)
+            # Cakupan digabung bila bersambung dengan cakupan lama; bila tidak, cakupan baru menggantikannya.
+            terbaru = terbaru_baru
+            if dari_lama and dari <= sampai_lama and sampai >= dari_lama:
+                dari, sampai = min(dari, dari_lama), max(sampai, sampai_lama)
+                terbaru = max((t for t in (terbaru_lama, terbaru_baru) if t), default=None)
+            self._conn.execute("INSERT OR REPLACE INTO watermark VALUES (?, ?, ?, ?, ?, ?)", (kunci, daerah, terbaru, dari, sampai, time.time()))
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO link_terlihat VALUES (?, ?, ?)",
+                [(kunci, daerah, canonicalize_url(e['link'])) for e in entries if e.get('link')],
+            )
+
+    def stats(self):
+        with self._lock:
+            pasangan = self._conn.execute("SELECT COUNT(*) FROM watermark").fetchone()[0]
+            links = self._conn.execute("SELECT COUNT(*) FROM link_terlihat").fetchone()[0]
+        return {"pasangan": pasangan, "link": links}
+
+    def hapus_semua(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM watermark")
+            self._conn.execute("DELETE FROM link_terlihat")
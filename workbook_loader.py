@@ -0,0 +1,99 @@
+# --- PEMUAT WORKBOOK (SEKALI UNDUH, REVALIDASI BERSYARAT) ---
+# Setiap workbook diunduh sekali dan semua sheet yang dibutuhkan diparse dalam
+# satu kali baca. Hasil parse disimpan sebagai snapshot pickle lokal; unduhan
+# berikutnya memakai ETag/Last-Modified dan hash isi, sehingga openpyxl hanya
+# dijalankan bila isi workbook benar-benar berubah.
+
+import hashlib
+import io
+import json
+import os
+import pickle
+import tempfile
+import time
+
+import pandas as pd
+import requests
+
+from storage import data_path
+
+BATAS_WAKTU_UNDUH = (5, 30)
+MIN_INTERVAL_REVALIDASI = 5 * 60
+
+
+def _nama_snapshot(url, sheet_names):
+    kunci = hashlib.sha1(json.dumps([url, [str(s) for s in sheet_names]]).encode("utf-8")).hexdigest()[:16]
+    return data_path(f"workbook_{kunci}.pkl"), data_path(f"workbook_{kunci}.json")
+
+
+def _baca_meta(path_meta):
+    try:
+        with open(path_meta, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _baca_snapshot(path_snapshot):
+    try:
+        with open(path_snapshot, "rb") as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+
+
+def _tulis_atomik(path, data, mode="wb"):
+    # File sementara unik per penulis: dua sesi yang memperbarui workbook yang sama tidak saling menimpa.
+    with tempfile.NamedTemporaryFile(mode, dir=os.path.dirname(path), prefix=os.path.basename(path) + ".", suffix=".tmp", delete=False, **({} if "b" in mode else {"encoding": "utf-8"})) as f:
+        f.write(data)
+    try:
+        os.replace(f.name, path)
+    except OSError:
+        os.remove(f.name)
+        raise
+
+
+def load_workbook(url, sheet_names=(0,), session=None, min_interval=0):
+    # Mengembalikan dict {sheet: DataFrame} untuk semua `sheet_names`.
+    # `min_interval` (detik) melewati revalidasi bila snapshot baru saja dicek.
+    sheet_names = list(sheet_names)
+    path_snapshot, path_meta = _nama_snapshot(url, sheet_names)
+    meta = _baca_meta(path_meta)
+    snapshot = _baca_snapshot(path_snapshot) if meta else None
+
+    if snapshot is not None and min_interval and time.time() - meta.get("dicek", 0) < min_interval:
+        return snapshot
+
+    headers = {}
+    if snapshot is not None:
+        if meta.get("etag"): headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"): headers["If-Modified-Since"] = meta["last_modified"]
+
+    try:
+        resp = (session or requests).get(url, headers=headers, timeout=BATAS_WAKTU_UNDUH)
+        if resp.status_code == 304 and snapshot is not None:
+            meta["dicek"] = time.time()
+            _tulis_atomik(path_meta, json.dumps(meta), "w")
+            return snapshot
+        resp.raise_for_status()
+    except requests.RequestException:
+        # Jaringan bermasalah: pakai snapshot terakhir bila ada.
+        if snapshot is not None:
+            return snapshot
+        raise
+
+    konten = resp.content
+    hash_isi = hashlib.sha256(konten).hexdigest()
+    if snapshot is None or hash_isi != meta.get("sha256"):
+        snapshot = pd.read_excel(io.BytesIO(konten), sheet_name=sheet_names)
+        _tulis_atomik(path_snapshot, pickle.dumps(snapshot, protocol=pickle.HIGHEST_PROTOCOL))
+
+    meta = {
+        "url": url,
+        "etag": resp.headers.get("ETag"),
+        "last_modified": resp.headers.get("Last-Modified"),
+        "sha256": hash_isi,
+        "dicek": time.time(),
+    }
+    _tulis_atomik(path_meta, json.dumps(meta), "w")
+    return snapshot